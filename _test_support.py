@@ -0,0 +1,35 @@
+"""
+Shared helpers for the test scripts
+Caches parsed chat exports so a full test run parses each file only once
+"""
+
+import mmap
+import os
+import sys
+from functools import lru_cache
+
+from parser import WhatsAppParser
+
+def _read_chat_text(path):
+    """Read a UTF-8 chat export, memory-mapping it where mmap semantics are reliable"""
+    if sys.platform == 'win32' or os.path.getsize(path) == 0:
+        with open(path, 'r', encoding='utf-8-sig') as f:
+            return f.read()
+    
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        return str(mm, 'utf-8-sig')
+
+@lru_cache(maxsize=8)
+def _parse_cached(path, mtime_ns):
+    """Parse a chat export; the mtime key makes edited files re-parse"""
+    parser = WhatsAppParser()
+    try:
+        return parser.parse_text(_read_chat_text(path))
+    except UnicodeDecodeError:
+        # Non-UTF-8 exports go through the parser's own encoding detection
+        return parser.parse_chat(path)
+
+def load_parsed_chat(path='sample_chat.txt'):
+    """Return a private copy of the parsed DataFrame for a chat export"""
+    path = os.path.abspath(path)
+    return _parse_cached(path, os.stat(path).st_mtime_ns).copy()
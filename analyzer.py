@@ -236,7 +236,9 @@ class HighPerformanceAnalyzer:
         start_time = time.time()
         # Use vectorized groupby operations
         hourly_dist = self.df['hour'].value_counts().sort_index().to_dict()
-        daily_dist = self.df['day_of_week'].value_counts().to_dict()
+        # day_of_week is categorical; drop the weekdays nobody posted on
+        daily_counts = self.df['day_of_week'].value_counts()
+        daily_dist = daily_counts[daily_counts > 0].to_dict()
         
         # Monthly distribution (if available)
         monthly_dist = {}
@@ -278,7 +280,7 @@ class HighPerformanceAnalyzer:
             return []
         
         # Use pivot table for efficiency
-        heatmap_pivot = self.df.groupby(['day_of_week', 'hour']).size().unstack(fill_value=0)
+        heatmap_pivot = self.df.groupby(['day_of_week', 'hour'], observed=True).size().unstack(fill_value=0)
         
         # Convert to required format
         days = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
@@ -190,7 +190,8 @@ class DatabaseManager:
             
         if isinstance(obj, dict):
             return {key: self.convert_to_json_safe(value) for key, value in obj.items()}
-        elif isinstance(obj, list):
+        elif isinstance(obj, (list, tuple)):
+            # Tuples such as (emoji, count) pairs round-trip as lists, not as their str()
             return [self.convert_to_json_safe(item) for item in obj]
         elif hasattr(obj, 'isoformat'):  # datetime objects
             return obj.isoformat()
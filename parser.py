@@ -14,6 +14,11 @@ from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 import multiprocessing as mp
 from functools import lru_cache
 
+# Fixed vocabularies for the calendar categoricals built in add_features_batch
+DAY_NAMES = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
+MONTH_NAMES = ['January', 'February', 'March', 'April', 'May', 'June', 'July',
+               'August', 'September', 'October', 'November', 'December']
+
 class HighPerformanceWhatsAppParser:
     def __init__(self):
         # Pre-compiled regex patterns for better performance
@@ -270,10 +275,19 @@ class HighPerformanceWhatsAppParser:
         df['date'] = df['timestamp'].dt.date
         df['time'] = df['timestamp'].dt.time
         df['hour'] = df['timestamp'].dt.hour
-        df['day_of_week'] = df['timestamp'].dt.day_name()
-        df['month'] = df['timestamp'].dt.strftime('%B')
         df['year'] = df['timestamp'].dt.year
-        df['month_year'] = df['timestamp'].dt.strftime('%B %Y')
+        
+        # Build name columns from integer codes instead of per-row strftime
+        day_codes = df['timestamp'].dt.dayofweek.to_numpy()
+        month_codes = df['timestamp'].dt.month.to_numpy() - 1
+        df['day_of_week'] = pd.Categorical.from_codes(day_codes, categories=DAY_NAMES)
+        df['month'] = pd.Categorical.from_codes(month_codes, categories=MONTH_NAMES)
+        
+        # Only the months present get a label, in chronological order
+        period_codes = df['year'].to_numpy() * 12 + month_codes
+        periods, period_index = np.unique(period_codes, return_inverse=True)
+        period_labels = [f"{MONTH_NAMES[p % 12]} {p // 12}" for p in periods]
+        df['month_year'] = pd.Categorical.from_codes(period_index, categories=period_labels)
         
         # Time period categorization
         df['time_period'] = pd.cut(df['hour'], 
@@ -327,60 +341,78 @@ class HighPerformanceWhatsAppParser:
             content, encoding = self.read_file_optimized(file_path)
             print(f"📄 File size: {len(content):,} characters, encoding: {encoding}")
             
-            # Detect format
-            chat_format = self.detect_format_fast(content)
-            if chat_format == 'unknown':
-                raise ValueError("Unable to detect chat format")
-            
-            print(f"🔍 Detected format: {chat_format}")
-            
-            # Parse messages in batches
-            messages = self.parse_messages_batch(content, chat_format)
-            
-            if not messages:
-                raise ValueError("No valid messages found")
-            
-            print(f"💬 Parsed {len(messages)} messages")
-            
-            # Create DataFrame
-            df_start = time.time()
-            df = pd.DataFrame(messages)
-            # Sort by timestamp for consistency
-            df = df.sort_values('timestamp').reset_index(drop=True)
-            self.time_and_log("DataFrame Creation", df_start)
-            
-            # Add features in batches
-            df = self.add_features_batch(df)
+            return self._parse_content(content, total_start_time)
             
-            # Add emoji features (can be slow for large datasets)
-            if len(df) < 50000:  # Only do emoji extraction for reasonable sizes
-                df = self.add_emoji_features_parallel(df)
-            else:
-                print("⚠️  Skipping emoji extraction for very large dataset (>50k messages)")
-                df['emojis'] = [[] for _ in range(len(df))]
-                df['emoji_count'] = 0
-                df['reactions_received'] = [[] for _ in range(len(df))]
-                df['reaction_count'] = 0
-            
-            # Clean up temporary columns
-            if 'raw_line' in df.columns:
-                df = df.drop('raw_line', axis=1)
-            
-            # Performance summary
-            total_time = time.time() - total_start_time
-            self.timing['Total Parsing Time'] = total_time
-            
-            print(f"\n🎉 Parsing completed!")
-            print(f"📊 Total time: {total_time:.2f}s")
-            print(f"📈 Messages/second: {len(df)/total_time:.1f}")
-            print(f"💾 Memory usage: ~{df.memory_usage(deep=True).sum() / 1024 / 1024:.1f} MB")
+        except Exception as e:
+            print(f"❌ Error during parsing: {str(e)}")
+            raise Exception(f"Error parsing chat: {str(e)}")
+    
+    def parse_text(self, content):
+        """Parse chat export text that is already in memory, skipping file I/O"""
+        total_start_time = time.time()
+        
+        try:
+            print("🚀 Starting high-performance parsing...")
+            print(f"📄 Text size: {len(content):,} characters")
             
-            return df
+            return self._parse_content(content, total_start_time)
             
         except Exception as e:
             print(f"❌ Error during parsing: {str(e)}")
             raise Exception(f"Error parsing chat: {str(e)}")
     
+    def _parse_content(self, content, total_start_time):
+        """Detect the format of raw chat text and build the feature DataFrame"""
+        # Detect format
+        chat_format = self.detect_format_fast(content)
+        if chat_format == 'unknown':
+            raise ValueError("Unable to detect chat format")
+        
+        print(f"🔍 Detected format: {chat_format}")
+        
+        # Parse messages in batches
+        messages = self.parse_messages_batch(content, chat_format)
+        
+        if not messages:
+            raise ValueError("No valid messages found")
+        
+        print(f"💬 Parsed {len(messages)} messages")
+        
+        # Create DataFrame
+        df_start = time.time()
+        df = pd.DataFrame(messages)
+        # Sort by timestamp for consistency
+        df = df.sort_values('timestamp').reset_index(drop=True)
+        self.time_and_log("DataFrame Creation", df_start)
+        
+        # Add features in batches
+        df = self.add_features_batch(df)
+        
+        # Add emoji features (can be slow for large datasets)
+        if len(df) < 50000:  # Only do emoji extraction for reasonable sizes
+            df = self.add_emoji_features_parallel(df)
+        else:
+            print("⚠️  Skipping emoji extraction for very large dataset (>50k messages)")
+            df['emojis'] = [[] for _ in range(len(df))]
+            df['emoji_count'] = 0
+            df['reactions_received'] = [[] for _ in range(len(df))]
+            df['reaction_count'] = 0
+        
+        # Clean up temporary columns
+        if 'raw_line' in df.columns:
+            df = df.drop('raw_line', axis=1)
+        
+        # Performance summary
+        total_time = time.time() - total_start_time
+        self.timing['Total Parsing Time'] = total_time
+        
+        print(f"\n🎉 Parsing completed!")
+        print(f"📊 Total time: {total_time:.2f}s")
+        print(f"📈 Messages/second: {len(df)/total_time:.1f}")
+        print(f"💾 Memory usage: ~{df.memory_usage(deep=True).sum() / 1024 / 1024:.1f} MB")
+        
+        return df
+    
     def get_performance_stats(self):
         """Get detailed performance statistics"""
         return {
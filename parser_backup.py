@@ -6,12 +6,23 @@ Fixed for iOS format and Arabic text support
 """
 
 import re
+import itertools
 import pandas as pd
 from datetime import datetime
 import emoji
 import numpy as np
 from typing import Dict, List, Tuple, Optional
 
+class _Msg:
+    """Lightweight per-message record used while scanning the chat"""
+    __slots__ = ('timestamp', 'sender', 'message')
+    
+    def __init__(self, timestamp, sender, message):
+        self.timestamp = timestamp
+        self.sender = sender
+        self.message = message
+
+
 class WhatsAppParser:
     def __init__(self):
         # Enhanced regex patterns for different WhatsApp formats
@@ -20,14 +31,12 @@ class WhatsAppParser:
             'ios_12h': r'\[(\d{1,2}/\d{1,2}/\d{2,4},\s\d{1,2}:\d{2}:\d{2}\s[APap][Mm])\]\s([^:]+):\s(.+)',
             'ios_24h': r'\[(\d{1,2}/\d{1,2}/\d{2,4},\s\d{1,2}:\d{2}:\d{2})\]\s([^:]+):\s(.+)',
             
-            # Android patterns - Enhanced for better compatibility
-            'android_12h_md': r'(\d{1,2}/\d{1,2}/\d{2,4},\s\d{1,2}:\d{2}\s[APap][Mm])\s-\s([^:]+):\s(.+)',
-            'android_12h_dm': r'(\d{1,2}/\d{1,2}/\d{2,4},\s\d{1,2}:\d{2}\s[APap][Mm])\s-\s([^:]+):\s(.+)',
-            'android_24h_md': r'(\d{1,2}/\d{1,2}/\d{2,4},\s\d{1,2}:\d{2})\s-\s([^:]+):\s(.+)',
-            'android_24h_dm': r'(\d{1,2}/\d{1,2}/\d{2,4},\s\d{1,2}:\d{2})\s-\s([^:]+):\s(.+)',
+            # Android patterns - month/day vs day/month order is resolved
+            # separately from the data, since the line shapes are identical
+            'android_12h': r'(\d{1,2}/\d{1,2}/\d{2,4},\s\d{1,2}:\d{2}\s[APap][Mm])\s-\s([^:]+):\s(.+)',
+            'android_24h': r'(\d{1,2}/\d{1,2}/\d{2,4},\s\d{1,2}:\d{2})\s-\s([^:]+):\s(.+)',
             
             # Alternative patterns for different formats
-            'android_alt1': r'(\d{1,2}/\d{1,2}/\d{2,4},\s\d{1,2}:\d{2}\s[apAP][mM])\s-\s([^:]+):\s(.+)',
             'android_alt2': r'(\d{1,2}/\d{1,2}/\d{2,4},\s\d{1,2}:\d{2}:\d{2}\s[APap][Mm])\s-\s([^:]+):\s(.+)',
             
             # European format
@@ -37,26 +46,36 @@ class WhatsAppParser:
             'custom': r'(\d{4}-\d{2}-\d{2}\s\d{2}:\d{2}:\d{2})\s-\s([^:]+):\s(.+)'
         }
         
+        # Pre-compiled once so detection doesn't go through the re cache per line
+        self._compiled_patterns = {fmt: re.compile(p) for fmt, p in self.patterns.items()}
+        
+        # Sender cleanup helpers, built once instead of per message
+        self._invisible_chars = dict.fromkeys([0x200c, 0x200d, 0x200e, 0x200f, 0xfeff], None)
+        self._phone_prefix_pattern = re.compile(r'^\+\d+\s*\d*\s*\d*\s*\d*')
+        self._whitespace_pattern = re.compile(r'\s+')
+        
+        # 'md' or 'dm' for Android exports, resolved per chat in parse_chat
+        self._date_order: Optional[str] = None
+        
         # Reaction pattern (for newer WhatsApp versions)
         self.reaction_pattern = r'(.+)\sreacted\s(.+)\sto\s"(.+)"'
         
     def detect_format(self, content):
         """Detect if the chat export is from Android or iOS"""
-        lines = content.split('\n')[:100]  # Check first 100 lines for better detection
-        
         format_counts = {fmt: 0 for fmt in self.patterns.keys()}
         
-        for line in lines:
-            line = line.strip()
-            if not line or len(line) < 20:  # Skip very short lines
-                continue
-                
-            for fmt, pattern in self.patterns.items():
-                try:
-                    if re.match(pattern, line):
-                        format_counts[fmt] += 1
-                except:
-                    continue
+        # Check the first 100 non-trivial lines; formats are mutually exclusive
+        # in practice, so stop at the first matching pattern per line and stop
+        # sampling once one format is clearly confident
+        candidate_lines = (l.strip() for l in content.split('\n'))
+        candidate_lines = (l for l in candidate_lines if len(l) >= 20)
+        for line in itertools.islice(candidate_lines, 100):
+            for fmt, pattern in self._compiled_patterns.items():
+                if pattern.match(line):
+                    format_counts[fmt] += 1
+                    break
+            if max(format_counts.values()) > 20:
+                break
         
         # Return the format with most matches
         max_format = max(format_counts, key=format_counts.get)
@@ -100,6 +119,7 @@ class WhatsAppParser:
             messages = []
             reactions = []
             lines = content.split('\n')
+            self._date_order = self.resolve_date_order(lines, chat_format)
             current_message = None
             
             for i, line in enumerate(lines):
@@ -136,18 +156,7 @@ class WhatsAppParser:
                         # Parse timestamp
                         timestamp = self.parse_timestamp(timestamp_str, chat_format)
                         
-                        current_message = {
-                            'timestamp': timestamp,
-                            'sender': self.clean_sender_name(sender),
-                            'message': message,
-                            'date': timestamp.date(),
-                            'time': timestamp.time(),
-                            'hour': timestamp.hour,
-                            'day_of_week': timestamp.strftime('%A'),
-                            'month': timestamp.strftime('%B'),
-                            'year': timestamp.year,
-                            'month_year': timestamp.strftime('%B %Y')
-                        }
+                        current_message = _Msg(timestamp, self.clean_sender_name(sender), message)
                     except Exception as e:
                         print(f"Error parsing timestamp '{timestamp_str}' on line {i}: {e}")
                         current_message = None
@@ -155,7 +164,7 @@ class WhatsAppParser:
                         
                 elif current_message and line.strip():
                     # Continuation of previous message
-                    current_message['message'] += ' ' + line.strip()
+                    current_message.message += ' ' + line.strip()
             
             # Add last message
             if current_message:
@@ -164,7 +173,11 @@ class WhatsAppParser:
             if not messages:
                 raise ValueError("No valid messages found in the chat file")
             
-            df = pd.DataFrame(messages)
+            df = pd.DataFrame({
+                'timestamp': pd.to_datetime([m.timestamp for m in messages]),
+                'sender': [m.sender for m in messages],
+                'message': [m.message for m in messages]
+            })
             
             # Sort by timestamp to ensure proper order
             df = df.sort_values('timestamp').reset_index(drop=True)
@@ -184,16 +197,42 @@ class WhatsAppParser:
             print(f"Detailed error: {str(e)}")
             raise Exception(f"Error parsing chat: {str(e)}")
     
+    def resolve_date_order(self, lines, chat_format, sample_size=500):
+        """Decide whether Android dates are month/day or day/month"""
+        if chat_format not in ('android_12h', 'android_24h'):
+            return None
+        
+        pattern = self._compiled_patterns[chat_format]
+        checked = 0
+        
+        for line in lines:
+            match = pattern.match(line.strip())
+            if not match:
+                continue
+            
+            first, second = match.group(1).split(',')[0].split('/')[:2]
+            if int(first) > 12:
+                return 'dm'
+            if int(second) > 12:
+                return 'md'
+            
+            checked += 1
+            if checked >= sample_size:
+                break
+        
+        # Ambiguous throughout - fall back to month/day
+        return 'md'
+    
     def clean_sender_name(self, sender):
         """Clean sender name - remove phone number prefixes and special characters"""
         # Remove invisible characters and special Unicode characters
-        sender = re.sub(r'[\u200c\u200d\u200e\u200f\ufeff]', '', sender)
+        sender = sender.translate(self._invisible_chars)
         
         # Remove country codes and clean phone numbers
-        sender = re.sub(r'^\+\d+\s*\d*\s*\d*\s*\d*', '', sender)
+        sender = self._phone_prefix_pattern.sub('', sender)
         
         # Clean up extra spaces and special characters
-        sender = re.sub(r'\s+', ' ', sender)
+        sender = self._whitespace_pattern.sub(' ', sender)
         sender = sender.strip()
         
         # If sender is still a number or very short, keep as is
@@ -204,6 +243,15 @@ class WhatsAppParser:
     
     def add_features(self, df):
         """Add additional features to the dataframe"""
+        # Calendar fields, derived column-wise rather than per message
+        df['date'] = df['timestamp'].dt.date
+        df['time'] = df['timestamp'].dt.time
+        df['hour'] = df['timestamp'].dt.hour
+        df['day_of_week'] = df['timestamp'].dt.day_name()
+        df['month'] = df['timestamp'].dt.month_name()
+        df['year'] = df['timestamp'].dt.year
+        df['month_year'] = df['month'] + ' ' + df['year'].astype(str)
+        
         # Extract emojis
         df['emojis'] = df['message'].apply(self.extract_emojis)
         df['emoji_count'] = df['emojis'].apply(len)
@@ -230,6 +278,13 @@ class WhatsAppParser:
         df['reactions_received'] = [[] for _ in range(len(df))]
         df['reaction_count'] = 0
         
+        # Low-cardinality columns as categoricals and narrow ints to shrink
+        # the working set and speed up downstream groupby/value_counts
+        for col in ['sender', 'day_of_week', 'month', 'month_year', 'time_period']:
+            df[col] = df[col].astype('category')
+        df['hour'] = df['hour'].astype('int8')
+        df['year'] = df['year'].astype('int16')
+        
         return df
     
     def add_reactions(self, df, reactions):
@@ -298,12 +353,6 @@ class WhatsAppParser:
                 '%d/%m/%Y, %H:%M',
                 '%d/%m/%y, %H:%M'
             ],
-            'android_alt1': [
-                '%m/%d/%Y, %I:%M %p',
-                '%d/%m/%Y, %I:%M %p',
-                '%m/%d/%y, %I:%M %p',
-                '%d/%m/%y, %I:%M %p'
-            ],
             'android_alt2': [
                 '%m/%d/%Y, %I:%M:%S %p',
                 '%d/%m/%Y, %I:%M:%S %p',
@@ -317,8 +366,9 @@ class WhatsAppParser:
             'custom': ['%Y-%m-%d %H:%M:%S']
         }
         
-        # Get format strings for detected format
-        formats = format_strings.get(chat_format, [])
+        # Get format strings for detected format (Android keys carry the date order)
+        formats = format_strings.get(f"{chat_format}_{self._date_order}",
+                                     format_strings.get(chat_format, []))
         
         # Also try generic formats
         all_formats = formats + [
@@ -37,7 +37,12 @@ def generate_large_test_file(filename, num_messages=50000):
     
     print(f"🔧 Generating {num_messages:,} messages test file...")
     
+    # Draw all senders and message bodies up front in one RNG call each
+    chosen_users = random.choices(users, k=num_messages)
+    chosen_messages = random.choices(messages, k=num_messages)
+    
     with open(filename, 'w', encoding='utf-8') as f:
+        batch = []
         for i in range(num_messages):
             # Random timestamp
             days_offset = random.randint(0, 30)  # Keep within a month for consistency
@@ -69,9 +74,8 @@ def generate_large_test_file(filename, num_messages=50000):
             
             timestamp_str = f"{month}/{day}/{year}, {hour_12}:{minute:02d} {ampm}"
             
-            # Random user and message
-            user = random.choice(users)
-            message = random.choice(messages)
+            user = chosen_users[i]
+            message = chosen_messages[i]
             
             # Add some variety
             if random.random() < 0.1:  # 10% media messages
@@ -79,7 +83,15 @@ def generate_large_test_file(filename, num_messages=50000):
             elif random.random() < 0.05:  # 5% questions
                 message += " What do you think?"
             
-            f.write(f"{timestamp_str} - {user}: {message}\n")
+            batch.append(f"{timestamp_str} - {user}: {message}\n")
+            
+            # Flush in batches to cut down on write calls
+            if len(batch) >= 4096:
+                f.write(''.join(batch))
+                batch.clear()
+        
+        if batch:
+            f.write(''.join(batch))
     
     file_size = os.path.getsize(filename) / (1024 * 1024)  # MB
     print(f"✅ Generated test file: {file_size:.1f} MB")
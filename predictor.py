@@ -6,8 +6,8 @@ Provides ML-based predictions for optimal messaging times and user activity
 import pandas as pd
 import numpy as np
 import re
-from datetime import datetime, timedelta
-from sklearn.ensemble import RandomForestRegressor, GradientBoostingRegressor
+from datetime import timedelta
+from sklearn.ensemble import HistGradientBoostingRegressor, GradientBoostingRegressor
 from sklearn.linear_model import LinearRegression
 from sklearn.model_selection import train_test_split, cross_val_score
 from sklearn.preprocessing import StandardScaler
@@ -15,127 +15,132 @@ from sklearn.metrics import mean_squared_error, r2_score
 import warnings
 warnings.filterwarnings('ignore')
 
+# Compiled once for the topic extraction text cleanup
+URL_PATTERN = re.compile(r'http\S+')
+
 class ChatPredictor:
     def __init__(self, df):
-        self.df = df.copy()
+        # Kept in time order so date ranges can be sliced with searchsorted
+        self.df = df.sort_values('timestamp', kind='stable').reset_index(drop=True)
+        self.timestamps = self.df['timestamp'].to_numpy(dtype='datetime64[ns]')
+        # Compact per-message time keys reused by the engagement calculations
+        self.day_of_week_codes = self.df['timestamp'].dt.dayofweek.to_numpy(dtype=np.int8)
+        self.hour_codes = self.df['hour'].to_numpy(dtype=np.int8)
         self.prepare_data()
         self.models = {}
         
     def prepare_data(self):
         """Prepare data for prediction models"""
-        # Create hourly activity data
+        # Create hourly activity data; calendar features are added on the
+        # complete grid below, so only the counts are needed here
         self.hourly_data = self.df.groupby(['date', 'hour']).size().reset_index(name='message_count')
         
-        # Add features
-        self.hourly_data['day_of_week'] = pd.to_datetime(self.hourly_data['date']).dt.dayofweek
-        self.hourly_data['month'] = pd.to_datetime(self.hourly_data['date']).dt.month
-        self.hourly_data['day'] = pd.to_datetime(self.hourly_data['date']).dt.day
-        self.hourly_data['is_weekend'] = self.hourly_data['day_of_week'].isin([5, 6]).astype(int)
-        
         # Create complete hourly grid
         date_range = pd.date_range(start=self.df['date'].min(), end=self.df['date'].max(), freq='D')
-        hour_range = range(24)
-        
-        complete_grid = []
-        for date in date_range:
-            for hour in hour_range:
-                complete_grid.append({
-                    'date': date.date(),
-                    'hour': hour,
-                    'day_of_week': date.dayofweek,
-                    'month': date.month,
-                    'day': date.day,
-                    'is_weekend': int(date.dayofweek in [5, 6])
-                })
+        grid_index = pd.MultiIndex.from_product(
+            [date_range.date, np.arange(24, dtype=np.int8)], names=['date', 'hour']
+        )
+        complete_df = grid_index.to_frame(index=False)
         
-        complete_df = pd.DataFrame(complete_grid)
+        # Calendar features come from the date range, repeated for each hour
+        complete_df['day_of_week'] = np.repeat(date_range.dayofweek.to_numpy(dtype=np.int8), 24)
+        complete_df['month'] = np.repeat(date_range.month.to_numpy(dtype=np.int8), 24)
+        complete_df['day'] = np.repeat(date_range.day.to_numpy(dtype=np.int8), 24)
+        complete_df['is_weekend'] = (complete_df['day_of_week'] >= 5).astype(np.int8)
         
         # Merge with actual data
         self.hourly_data = complete_df.merge(
             self.hourly_data[['date', 'hour', 'message_count']], 
             on=['date', 'hour'], 
             how='left'
-        )
-        self.hourly_data['message_count'].fillna(0, inplace=True)
+        ).fillna({'message_count': 0})
+        self.hourly_data['message_count'] = self.hourly_data['message_count'].astype(np.int32)
         
         # Add lag features
         for lag in [1, 2, 3, 7, 14]:
             self.hourly_data[f'lag_{lag}'] = self.hourly_data['message_count'].shift(lag * 24)
         
         # Add rolling statistics
-        self.hourly_data['rolling_mean_7d'] = self.hourly_data['message_count'].rolling(window=7*24, min_periods=1).mean()
-        self.hourly_data['rolling_std_7d'] = self.hourly_data['message_count'].rolling(window=7*24, min_periods=1).std()
+        rolling_mean, rolling_std = self._rolling_mean_std(self.hourly_data['message_count'].to_numpy(), 7*24)
+        self.hourly_data['rolling_mean_7d'] = rolling_mean
+        self.hourly_data['rolling_std_7d'] = rolling_std
         
-        # Drop NaN values
-        self.hourly_data.dropna(inplace=True)
+        # Only the leading rows lack the longest lag, so drop them by position
+        self.hourly_data = self.hourly_data.iloc[14*24:].reset_index(drop=True)
+    
+    @staticmethod
+    def _rolling_mean_std(values, window):
+        """Trailing mean and sample std (min_periods=1) from running sums in one pass"""
+        values = np.asarray(values, dtype=np.float64)
+        sums = np.concatenate(([0.0], np.cumsum(values)))
+        squares = np.concatenate(([0.0], np.cumsum(values * values)))
+        
+        end = np.arange(1, len(values) + 1)
+        start = np.maximum(end - window, 0)
+        n = end - start
+        
+        window_sum = sums[end] - sums[start]
+        mean = window_sum / n
+        with np.errstate(divide='ignore', invalid='ignore'):
+            variance = (squares[end] - squares[start] - window_sum * mean) / (n - 1)
+        std = np.sqrt(np.clip(variance, 0, None))
+        std[n < 2] = np.nan
+        return mean, std
     
     def predict_optimal_messaging_time(self):
         """Predict optimal times to send messages for maximum engagement"""
+        day_names = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
         
-        # Aggregate activity by hour and day
-        activity_matrix = self.df.groupby(['day_of_week', 'hour']).size().unstack(fill_value=0)
+        # With a single participant nobody can respond, so every score would be 0
+        if self.df['sender'].nunique() < 2:
+            return {
+                'optimal_times_by_day': {day: [] for day in day_names},
+                'overall_best_times': [],
+                'engagement_heatmap': []
+            }
         
-        # Calculate engagement score (messages + responses)
-        engagement_scores = {}
+        # Aggregate activity by hour and day; slot = day_of_week * 24 + hour
+        slots = self.day_of_week_codes.astype(np.intp) * 24 + self.hour_codes
+        activity_matrix = np.bincount(slots, minlength=7*24)
         
-        for day in range(7):
-            for hour in range(24):
-                # Get messages sent at this time
-                messages_at_time = self.df[
-                    (self.df['timestamp'].dt.dayofweek == day) & 
-                    (self.df['hour'] == hour)
-                ]
-                
-                if len(messages_at_time) > 0:
-                    # Calculate average response rate within next 2 hours
-                    response_count = 0
-                    for _, msg in messages_at_time.iterrows():
-                        next_messages = self.df[
-                            (self.df['timestamp'] > msg['timestamp']) & 
-                            (self.df['timestamp'] <= msg['timestamp'] + timedelta(hours=2)) &
-                            (self.df['sender'] != msg['sender'])
-                        ]
-                        response_count += len(next_messages)
-                    
-                    engagement_score = response_count / len(messages_at_time)
-                else:
-                    engagement_score = 0
-                
-                engagement_scores[(day, hour)] = engagement_score
+        # Responses each message received from other senders within 2 hours
+        responses = self._count_responses(window=timedelta(hours=2))
+        response_totals = np.bincount(slots, weights=responses, minlength=7*24)
         
-        # Convert to DataFrame for analysis
-        engagement_df = pd.DataFrame([
-            {'day_of_week': k[0], 'hour': k[1], 'engagement_score': v}
-            for k, v in engagement_scores.items()
-        ])
+        # Engagement score: average responses per message in each slot,
+        # with every slot of the week reported (empty ones score 0)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            scores = np.where(activity_matrix > 0, response_totals / activity_matrix, 0.0)
+        
+        engagement_df = pd.DataFrame({
+            'day_of_week': np.repeat(np.arange(7), 24),
+            'hour': np.tile(np.arange(24), 7),
+            'engagement_score': scores
+        })
         
         # Get top times for each day
-        day_names = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
         optimal_times = {}
         
+        day_scores = scores.reshape(7, 24)
         for day in range(7):
-            day_data = engagement_df[engagement_df['day_of_week'] == day]
-            if not day_data.empty:
-                top_hours = day_data.nlargest(3, 'engagement_score')
-                optimal_times[day_names[day]] = [
-                    {
-                        'hour': int(row['hour']),  # Convert to int
-                        'time': f"{int(row['hour']):02d}:00",  # Convert to int before formatting
-                        'engagement_score': row['engagement_score']
-                    }
-                    for _, row in top_hours.iterrows()
-                ]
+            optimal_times[day_names[day]] = [
+                {
+                    'hour': int(hour),
+                    'time': f"{hour:02d}:00",
+                    'engagement_score': float(day_scores[day, hour])
+                }
+                for hour in self._top_k(day_scores[day], 3)
+            ]
         
         # Overall best times
-        overall_best = engagement_df.nlargest(10, 'engagement_score')
         overall_best_times = [
             {
-                'day': day_names[int(row['day_of_week'])],  # Convert to int
-                'hour': int(row['hour']),  # Convert to int
-                'time': f"{day_names[int(row['day_of_week'])]} {int(row['hour']):02d}:00",  # Convert to int
-                'engagement_score': row['engagement_score']
+                'day': day_names[slot // 24],
+                'hour': int(slot % 24),
+                'time': f"{day_names[slot // 24]} {slot % 24:02d}:00",
+                'engagement_score': float(scores[slot])
             }
-            for _, row in overall_best.iterrows()
+            for slot in self._top_k(scores, 10)
         ]
         
         return {
@@ -144,6 +149,49 @@ class ChatPredictor:
             'engagement_heatmap': engagement_df.to_dict('records')
         }
     
+    @staticmethod
+    def _top_k(values, k):
+        """Indices of the k largest values, largest first; ties keep earlier positions first"""
+        if len(values) <= k:
+            return np.argsort(-values, kind='stable')
+        
+        # k-th largest value via an O(n) partition, then order just the candidates
+        cutoff = np.partition(values, len(values) - k)[len(values) - k]
+        candidates = np.flatnonzero(values >= cutoff)
+        return candidates[np.argsort(-values[candidates], kind='stable')][:k]
+    
+    def _count_responses(self, window):
+        """Count, for every message, the later messages by other senders within window"""
+        if self.df.empty:
+            return np.zeros(0, dtype=np.int64)
+        
+        # Chat timestamps have second resolution; whole seconds keep the
+        # per-sender offsets below comfortably inside int64
+        timestamps = self.df['timestamp'].to_numpy(dtype='datetime64[s]').view(np.int64)
+        timestamps = timestamps - timestamps.min()
+        senders, _ = pd.factorize(self.df['sender'])
+        window_s = int(window.total_seconds())
+        
+        # Window (ts, ts + window] for every message, from all senders
+        counts = self._count_in_window(timestamps, window_s)
+        
+        # Remove the sender's own follow-up messages: shifting each sender onto
+        # a separate stretch of the time axis keeps their windows disjoint
+        span = timestamps.max() + window_s + 1
+        counts -= self._count_in_window(senders.astype(np.int64) * span + timestamps, window_s)
+        return counts
+    
+    @staticmethod
+    def _count_in_window(keys, window):
+        """Number of keys in (key, key + window] for each key, in input order"""
+        order = np.argsort(keys, kind='stable')
+        sorted_keys = keys[order]
+        
+        counts = np.empty(len(keys), dtype=np.int64)
+        counts[order] = (np.searchsorted(sorted_keys, sorted_keys + window, side='right') -
+                         np.searchsorted(sorted_keys, sorted_keys, side='right'))
+        return counts
+    
     def predict_future_activity(self, days_ahead=7):
         """Predict future chat activity"""
         
@@ -168,7 +216,7 @@ class ChatPredictor:
         # Filter to existing columns
         feature_cols = [col for col in feature_cols if col in self.hourly_data.columns]
         
-        X = self.hourly_data[feature_cols]
+        X = self.hourly_data[feature_cols].astype(np.float32)
         y = self.hourly_data['message_count']
         
         # Handle small datasets
@@ -176,29 +224,18 @@ class ChatPredictor:
             # Use simple average for prediction
             avg_by_hour = self.hourly_data.groupby('hour')['message_count'].mean()
             
-            predictions = []
-            last_date = pd.to_datetime(self.df['date'].max())
-            future_dates = pd.date_range(start=last_date + timedelta(days=1), periods=days_ahead, freq='D')
-            
-            for date in future_dates:
-                for hour in range(24):
-                    pred_value = avg_by_hour.get(hour, 0)
-                    predictions.append({
-                        'date': date.date(),
-                        'hour': hour,
-                        'datetime': datetime.combine(date.date(), datetime.min.time()) + timedelta(hours=hour),
-                        'predicted_messages': max(0, int(pred_value)),
-                        'day_name': date.strftime('%A')
-                    })
+            predictions_df = self._future_frame(days_ahead)
+            pred_values = predictions_df['hour'].map(avg_by_hour).fillna(0).to_numpy()
+            predictions_df['predicted_messages'] = np.maximum(0, pred_values.astype(int))
+            predictions_df = predictions_df[['date', 'hour', 'datetime', 'predicted_messages', 'day_name']]
             
-            predictions_df = pd.DataFrame(predictions)
             daily_predictions = predictions_df.groupby(['date', 'day_name'])['predicted_messages'].sum().reset_index()
             
             return {
                 'hourly_predictions': predictions_df.to_dict('records'),
                 'daily_predictions': daily_predictions.to_dict('records'),
                 'model_accuracy': 0.5,  # Simple model
-                'peak_predicted_hours': avg_by_hour.nlargest(5).to_dict() if len(avg_by_hour) > 0 else {},
+                'peak_predicted_hours': avg_by_hour.iloc[self._top_k(avg_by_hour.to_numpy(), 5)].to_dict() if len(avg_by_hour) > 0 else {},
                 'total_predicted_messages': predictions_df['predicted_messages'].sum()
             }
         
@@ -209,7 +246,9 @@ class ChatPredictor:
         
         # Train multiple models
         models = {
-            'random_forest': RandomForestRegressor(n_estimators=50, random_state=42, max_depth=5),
+            'hist_gradient_boosting': HistGradientBoostingRegressor(
+                max_iter=100, max_depth=5, learning_rate=0.1, early_stopping=True, random_state=42
+            ),
             'linear_regression': LinearRegression()
         }
         
@@ -233,58 +272,39 @@ class ChatPredictor:
             best_model.fit(X, y)
             best_score = 0.5
         
-        # Generate future predictions
-        last_date = pd.to_datetime(self.df['date'].max())
-        future_dates = pd.date_range(start=last_date + timedelta(days=1), periods=days_ahead, freq='D')
-        
-        predictions = []
-        
-        for date in future_dates:
-            for hour in range(24):
-                # Prepare features for prediction
-                features = {
-                    'hour': hour,
-                    'day_of_week': date.dayofweek,
-                    'month': date.month,
-                    'day': date.day,
-                    'is_weekend': int(date.dayofweek in [5, 6])
-                }
-                
-                # Add lag features if needed
-                if 'lag_1' in feature_cols:
-                    recent_data = self.hourly_data.tail(14*24) if len(self.hourly_data) > 14*24 else self.hourly_data
-                    features['lag_1'] = recent_data['message_count'].mean()
-                    if 'lag_2' in feature_cols:
-                        features['lag_2'] = features['lag_1'] * 0.9
-                    if 'lag_3' in feature_cols:
-                        features['lag_3'] = features['lag_1'] * 0.8
-                    if 'lag_7' in feature_cols:
-                        features['lag_7'] = features['lag_1'] * 0.7
-                    if 'rolling_mean_7d' in feature_cols:
-                        features['rolling_mean_7d'] = features['lag_1']
-                
-                # Make prediction
-                feature_vector = pd.DataFrame([features])[feature_cols]
-                try:
-                    pred = best_model.predict(feature_vector)[0]
-                except:
-                    pred = 0
-                
-                predictions.append({
-                    'date': date.date(),
-                    'hour': hour,
-                    'datetime': datetime.combine(date.date(), datetime.min.time()) + timedelta(hours=hour),
-                    'predicted_messages': max(0, int(pred)),
-                    'day_name': date.strftime('%A')
-                })
+        # Generate future predictions for every hour in a single predict call
+        predictions_df = self._future_frame(days_ahead)
+        features = predictions_df[['hour', 'day_of_week', 'month', 'day', 'is_weekend']].copy()
+        
+        # Add lag features if needed
+        if 'lag_1' in feature_cols:
+            recent_data = self.hourly_data.tail(14*24) if len(self.hourly_data) > 14*24 else self.hourly_data
+            recent_mean = recent_data['message_count'].mean()
+            features['lag_1'] = recent_mean
+            if 'lag_2' in feature_cols:
+                features['lag_2'] = recent_mean * 0.9
+            if 'lag_3' in feature_cols:
+                features['lag_3'] = recent_mean * 0.8
+            if 'lag_7' in feature_cols:
+                features['lag_7'] = recent_mean * 0.7
+            if 'rolling_mean_7d' in feature_cols:
+                features['rolling_mean_7d'] = recent_mean
+        
+        # Make prediction
+        try:
+            preds = best_model.predict(features[feature_cols].astype(np.float32))
+        except:
+            preds = np.zeros(len(features))
         
-        predictions_df = pd.DataFrame(predictions)
+        predictions_df['predicted_messages'] = np.maximum(0, preds.astype(int))
+        predictions_df = predictions_df[['date', 'hour', 'datetime', 'predicted_messages', 'day_name']]
         
         # Aggregate daily predictions
         daily_predictions = predictions_df.groupby(['date', 'day_name'])['predicted_messages'].sum().reset_index()
         
         # Identify peak hours in predictions
-        peak_hours = predictions_df.groupby('hour')['predicted_messages'].mean().nlargest(5)
+        hourly_means = predictions_df.groupby('hour')['predicted_messages'].mean()
+        peak_hours = hourly_means.iloc[self._top_k(hourly_means.to_numpy(), 5)]
         
         return {
             'hourly_predictions': predictions_df.to_dict('records'),
@@ -294,49 +314,77 @@ class ChatPredictor:
             'total_predicted_messages': predictions_df['predicted_messages'].sum()
         }
     
+    def _future_frame(self, days_ahead):
+        """Date x hour grid for the days following the chat, with model features"""
+        last_date = pd.to_datetime(self.df['date'].max())
+        future_dates = pd.date_range(start=last_date + timedelta(days=1), periods=days_ahead, freq='D')
+        
+        future_df = pd.MultiIndex.from_product(
+            [future_dates, np.arange(24)], names=['day_start', 'hour']
+        ).to_frame(index=False)
+        day_start = future_df['day_start']
+        
+        future_df['date'] = day_start.dt.date
+        future_df['datetime'] = day_start + pd.to_timedelta(future_df['hour'], unit='h')
+        future_df['day_name'] = day_start.dt.day_name()
+        future_df['day_of_week'] = day_start.dt.dayofweek.to_numpy(dtype=np.int8)
+        future_df['month'] = day_start.dt.month.to_numpy(dtype=np.int8)
+        future_df['day'] = day_start.dt.day.to_numpy(dtype=np.int8)
+        future_df['is_weekend'] = (future_df['day_of_week'].to_numpy() >= 5).astype(np.int8)
+        return future_df
+    
     def predict_user_activity(self):
         """Predict when specific users are likely to be active"""
         
         user_predictions = {}
         
-        for user in self.df['sender'].unique():
-            user_df = self.df[self.df['sender'] == user]
-            
-            if len(user_df) < 5:
-                continue
-            
-            # Create activity pattern
-            user_activity = user_df.groupby(['day_of_week', 'hour']).size().reset_index(name='count')
-            
-            # Calculate probability of activity
-            total_messages = len(user_df)
-            user_activity['probability'] = user_activity['count'] / total_messages
-            
-            # Find peak activity times
-            peak_times = user_activity.nlargest(10, 'probability')
-            
-            # Create prediction model for this user
-            user_hourly = user_df.groupby(['date', 'hour']).size().reset_index(name='message_count')
-            
-            if len(user_hourly) > 10:  # Need enough data for prediction
-                # Add features
-                user_hourly['day_of_week'] = pd.to_datetime(user_hourly['date']).dt.dayofweek
-                user_hourly['is_weekend'] = user_hourly['day_of_week'].isin([5, 6]).astype(int)
-                
-                # Simple prediction based on historical patterns
-                avg_by_hour = user_hourly.groupby('hour')['message_count'].mean()
-                avg_by_day = user_hourly.groupby('day_of_week')['message_count'].mean()
-                
-                user_predictions[user] = {
-                    'peak_hours': peak_times[['day_of_week', 'hour', 'probability']].to_dict('records'),
-                    'avg_messages_by_hour': avg_by_hour.to_dict(),
-                    'avg_messages_by_day': avg_by_day.to_dict(),
-                    'total_messages': total_messages,
-                    'active_probability': user_activity.to_dict('records')
-                }
+        # Group once across all senders instead of re-scanning the chat per user.
+        # observed=True keeps categorical day names from adding empty slots.
+        total_by_user = self.df['sender'].value_counts()
+        slot_counts = self.df.groupby(['sender', 'day_of_week', 'hour'], observed=True).size()
+        
+        user_hourly = self.df.groupby(['sender', 'date', 'hour'], observed=True).size().reset_index(name='message_count')
+        user_hourly['day_of_week'] = pd.to_datetime(user_hourly['date']).dt.dayofweek.to_numpy(dtype=np.int8)
+        hours_by_user = user_hourly['sender'].value_counts()
+        avg_by_hour = user_hourly.groupby(['sender', 'hour'])['message_count'].mean()
+        avg_by_day = user_hourly.groupby(['sender', 'day_of_week'])['message_count'].mean()
+        
+        # Need enough messages and active hours for prediction
+        senders = pd.Index(self.df['sender'].unique())
+        eligible = senders[(total_by_user.reindex(senders).to_numpy() >= 5) &
+                           (hours_by_user.reindex(senders, fill_value=0).to_numpy() > 10)]
+        
+        for user in eligible:
+            user_predictions[user] = self._user_activity_summary(
+                slot_counts.loc[user], total_by_user[user], avg_by_hour.loc[user], avg_by_day.loc[user]
+            )
         
         return user_predictions
     
+    def _user_activity_summary(self, user_slots, total_messages, avg_by_hour, avg_by_day):
+        """Activity prediction for one user from their pre-grouped counts"""
+        # Activity pattern and probability of activity
+        user_activity = user_slots.reset_index(name='count')
+        user_activity['probability'] = user_activity['count'] / total_messages
+        
+        # Find peak activity times
+        peak_times = user_activity.iloc[self._top_k(user_activity['probability'].to_numpy(), 10)]
+        
+        return {
+            'peak_hours': peak_times[['day_of_week', 'hour', 'probability']].to_dict('records'),
+            'avg_messages_by_hour': avg_by_hour.to_dict(),
+            'avg_messages_by_day': avg_by_day.to_dict(),
+            'total_messages': int(total_messages),
+            'active_probability': user_activity.to_dict('records')
+        }
+    
+    def _rows_between(self, start_date, end_date=None):
+        """Messages dated on or after start_date and before end_date"""
+        start = np.searchsorted(self.timestamps, np.datetime64(start_date, 'ns'), side='left')
+        end = (np.searchsorted(self.timestamps, np.datetime64(end_date, 'ns'), side='left')
+               if end_date is not None else len(self.timestamps))
+        return self.df.iloc[start:end]
+    
     def predict_conversation_topics(self):
         """Predict trending topics based on recent conversations"""
         
@@ -349,29 +397,31 @@ class ChatPredictor:
         
         # Get recent messages (last 30 days or all if less)
         recent_date = self.df['date'].max() - timedelta(days=30)
-        recent_messages = self.df[self.df['date'] >= recent_date] if len(self.df) > 100 else self.df
+        recent_messages = self._rows_between(recent_date) if len(self.df) > 100 else self.df
         
         # Extract keywords from recent messages
         from sklearn.feature_extraction.text import TfidfVectorizer
         
         # Clean messages
-        messages = recent_messages[~recent_messages['is_media']]['message'].dropna()
-        messages = messages.apply(lambda x: re.sub(r'http\S+', '', str(x)))  # Remove URLs
+        messages = recent_messages.loc[~recent_messages['is_media'], 'message'].dropna()
         
         if len(messages) > 5:
             try:
-                # TF-IDF analysis
+                # TF-IDF analysis; URLs are stripped lazily as the vectorizer reads
+                texts = (URL_PATTERN.sub('', str(message)) for message in messages)
                 vectorizer = TfidfVectorizer(
                     max_features=20, 
                     stop_words='english', 
                     ngram_range=(1, 2),
-                    min_df=2 if len(messages) > 20 else 1
+                    min_df=2 if len(messages) > 20 else 1,
+                    max_df=0.95,
+                    dtype=np.float32
                 )
-                tfidf_matrix = vectorizer.fit_transform(messages)
+                tfidf_matrix = vectorizer.fit_transform(texts)
                 
                 # Get feature names and scores
                 feature_names = vectorizer.get_feature_names_out()
-                scores = tfidf_matrix.sum(axis=0).A1
+                scores = np.asarray(tfidf_matrix.sum(axis=0)).ravel()
                 
                 # Create topic predictions
                 topics = []
@@ -399,17 +449,20 @@ class ChatPredictor:
     def analyze_topic_evolution(self, messages):
         """Analyze how topics evolve over time"""
         
+        week_count = min(4, len(self.df) // 7)
+        if week_count == 0:
+            return []
+        
+        # Week boundaries back from the last chat date, resolved to row positions once
+        last_date = self.timestamps[-1].astype('datetime64[D]')
+        boundaries = last_date - np.arange(week_count + 1) * np.timedelta64(7, 'D')
+        positions = np.searchsorted(self.timestamps, boundaries.astype('datetime64[ns]'), side='left')
+        
         # Group messages by week
         weekly_messages = []
-        for week_offset in range(min(4, len(self.df) // 7)):
-            week_start = self.df['date'].max() - timedelta(weeks=week_offset+1)
-            week_end = self.df['date'].max() - timedelta(weeks=week_offset)
-            
-            week_msgs = self.df[
-                (self.df['date'] >= week_start) & 
-                (self.df['date'] < week_end) & 
-                (~self.df['is_media'])
-            ]['message'].dropna()
+        for week_offset in range(week_count):
+            week_df = self.df.iloc[positions[week_offset + 1]:positions[week_offset]]
+            week_msgs = week_df.loc[~week_df['is_media'], 'message'].dropna()
             
             if len(week_msgs) > 3:
                 weekly_messages.append({
@@ -417,17 +470,31 @@ class ChatPredictor:
                     'messages': ' '.join(week_msgs.astype(str))
                 })
         
+        if not weekly_messages:
+            return []
+        
+        # Tokenize all weeks at once; words longer than 3 characters
+        from sklearn.feature_extraction.text import CountVectorizer
+        
+        vectorizer = CountVectorizer(token_pattern=r'(?u)\b\w{4,}\b', lowercase=True)
+        try:
+            word_counts = vectorizer.fit_transform([w['messages'] for w in weekly_messages])
+        except ValueError:
+            # No week has any qualifying words
+            return []
+        vocabulary = vectorizer.get_feature_names_out()
+        
         # Extract top words for each week
         evolution = []
-        for week_data in weekly_messages:
-            words = re.sub(r'[^\w\s]', ' ', week_data['messages'].lower()).split()
-            words = [w for w in words if len(w) > 3]
+        for week_data, row in zip(weekly_messages, word_counts):
+            counts = row.toarray().ravel()
+            top = np.argsort(-counts, kind='stable')[:5]
+            top = top[counts[top] > 0]
             
-            if words:
-                word_freq = pd.Series(words).value_counts().head(5)
+            if len(top):
                 evolution.append({
                     'week': week_data['week'],
-                    'top_words': word_freq.to_dict()
+                    'top_words': dict(zip(vocabulary[top].tolist(), counts[top].tolist()))
                 })
         
         return evolution
@@ -5,8 +5,70 @@ Installs dependencies, downloads required data, and verifies installation
 
 import os
 import sys
+import importlib
+import importlib.metadata
 import subprocess
 import platform
+import re
+import socket
+import sysconfig
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+# Third-party packages imported by test_installation
+CORE_PACKAGES = ('pandas', 'numpy', 'plotly', 'streamlit', 'fastapi', 'emoji')
+
+# pip releases older than this are upgraded before installing requirements
+MIN_PIP_VERSION = (24, 0)
+
+# NLTK package ids and the resource paths that show they are already installed
+NLTK_RESOURCES = {
+    'punkt': 'tokenizers/punkt',
+    'stopwords': 'corpora/stopwords',
+    'vader_lexicon': 'sentiment/vader_lexicon.zip',
+}
+
+# Sample chat with reactions and media
+SAMPLE_CHAT = """8/1/25, 9:00 AM - John Doe: Good morning everyone! 🌞
+8/1/25, 9:05 AM - Jane Smith: Morning John! How's everyone doing today?
+8/1/25, 9:10 AM - Bob Wilson: Great! Just finished breakfast 😊
+8/1/25, 9:15 AM - Alice Brown: Hey guys! Anyone up for coffee later? ☕
+8/1/25, 9:20 AM - John Doe: Count me in! 
+8/1/25, 9:25 AM - Jane Smith: <Media omitted>
+8/1/25, 9:26 AM - Bob Wilson: Nice photo Jane! Where is that?
+8/1/25, 9:27 AM - Jane Smith: Central Park this morning! Beautiful weather
+8/1/25, 10:00 AM - Alice Brown: Wow, gorgeous! 😍
+8/1/25, 10:30 AM - John Doe: So coffee at 3 PM? ☕
+8/1/25, 10:31 AM - Bob Wilson: Works for me 👍
+8/1/25, 10:32 AM - Jane Smith: Same here!
+8/1/25, 10:33 AM - Alice Brown: Perfect! See you all at the usual place
+8/1/25, 2:00 PM - John Doe: Running a bit late, be there by 3:15
+8/1/25, 2:01 PM - Jane Smith: No worries! We'll wait
+8/1/25, 3:00 PM - Bob Wilson: I'm here! Got us a table
+8/1/25, 3:05 PM - Alice Brown: On my way! 5 minutes
+8/1/25, 3:10 PM - Jane Smith: Just arrived! 
+8/1/25, 3:15 PM - John Doe: Here! Sorry for the delay
+8/1/25, 5:00 PM - Bob Wilson: That was fun! We should do this more often
+8/1/25, 5:01 PM - Alice Brown: Absolutely! Same time next week?
+8/1/25, 5:02 PM - Jane Smith: I'm in! 🎉
+8/1/25, 5:03 PM - John Doe: Me too! Thanks for today everyone
+8/2/25, 8:00 AM - Jane Smith: Good morning! Ready for another day? 💪
+8/2/25, 8:15 AM - Bob Wilson: Morning! Already at work
+8/2/25, 8:30 AM - John Doe: Morning all! Busy day ahead
+8/2/25, 8:45 AM - Alice Brown: Same here! Let's crush it today! 💯
+8/2/25, 12:00 PM - Jane Smith: Lunch break! What's everyone having?
+8/2/25, 12:05 PM - Bob Wilson: Sandwich and salad 🥗
+8/2/25, 12:10 PM - John Doe: Pizza day for me! 🍕
+8/2/25, 12:15 PM - Alice Brown: Sushi! 🍱
+8/2/25, 12:20 PM - Jane Smith: You all are making me hungry! 😂
+8/2/25, 6:00 PM - Bob Wilson: Heading home! Have a great evening everyone
+8/2/25, 6:05 PM - John Doe: You too Bob! See you tomorrow
+8/2/25, 6:10 PM - Alice Brown: Bye everyone! 👋
+8/2/25, 6:15 PM - Jane Smith: Have a good night all! 🌙"""
+
+# Encoded once at import; the sample files are written as raw bytes
+SAMPLE_CHAT_BYTES = SAMPLE_CHAT.encode('utf-8')
 
 def print_header():
     """Print setup header"""
@@ -25,21 +87,83 @@ def check_python_version():
     print(f"✅ Python {version.major}.{version.minor}.{version.micro} detected")
     return True
 
+def read_requirements(path='requirements.txt'):
+    """Return the requirement specifiers listed in a requirements file"""
+    lines = (line.strip() for line in Path(path).read_text(encoding='utf-8').splitlines())
+    return [line for line in lines if line and not line.startswith('#')]
+
+def pip_is_current():
+    """Check the installed pip version against MIN_PIP_VERSION without a network call"""
+    try:
+        version = importlib.metadata.version('pip')
+    except importlib.metadata.PackageNotFoundError:
+        return False
+    return tuple(int(part) for part in re.findall(r'\d+', version)[:2]) >= MIN_PIP_VERSION
+
+def run_pip(args):
+    """Run a pip command, streaming its output line by line; raise on failure"""
+    command = [sys.executable, "-m", "pip", *args, "--disable-pip-version-check"]
+    with subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                          bufsize=1, text=True) as proc:
+        for line in proc.stdout:
+            sys.stdout.write(line)
+    
+    if proc.returncode:
+        raise subprocess.CalledProcessError(proc.returncode, command)
+
+def compile_site_packages():
+    """Byte-compile site-packages in one parallel pass after --no-compile installs"""
+    site_dirs = sorted({sysconfig.get_paths()['purelib'], sysconfig.get_paths()['platlib']})
+    subprocess.run([sys.executable, "-m", "compileall", "-q", "-j", "0", *site_dirs])
+
+def install_from_parallel_downloads(requirements, workers=4):
+    """Download requirement shards concurrently, then install them offline in one pip run"""
+    shards = [requirements[i::workers] for i in range(workers) if requirements[i::workers]]
+    
+    with tempfile.TemporaryDirectory() as wheel_root:
+        # One directory per shard so concurrent downloads of a shared dependency never collide
+        shard_dirs = [os.path.join(wheel_root, f"shard{i}") for i in range(len(shards))]
+        
+        def download(shard, dest):
+            return subprocess.run(
+                [sys.executable, "-m", "pip", "download", "--quiet", "--dest", dest, *shard]
+            ).returncode
+        
+        with ThreadPoolExecutor(max_workers=len(shards)) as executor:
+            return_codes = list(executor.map(download, shards, shard_dirs))
+        
+        if any(return_codes):
+            return False
+        
+        find_links = [arg for d in shard_dirs for arg in ("--find-links", d)]
+        try:
+            run_pip(["install", "--no-index", "--no-compile", "--no-warn-script-location",
+                     *find_links, *requirements])
+        except subprocess.CalledProcessError:
+            return False
+        return True
+
 def install_requirements():
     """Install required packages"""
     print("\n📦 Installing required packages...")
     print("This may take a few minutes...\n")
     
     try:
-        # Upgrade pip first
-        subprocess.check_call([sys.executable, "-m", "pip", "install", "--upgrade", "pip"], 
-                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        # Upgrade pip first, unless it is already recent enough
+        if not pip_is_current():
+            run_pip(["install", "--upgrade", "pip"])
+        
+        # Fetch packages in parallel; a single offline install keeps site-packages writes serial
+        if not install_from_parallel_downloads(read_requirements()):
+            print("⚠️ Parallel install failed, falling back to a regular install...")
+            run_pip(["install", "--no-compile", "--no-warn-script-location", "-r", "requirements.txt"])
+        
+        # Installs skip per-file bytecode compilation; do it all at once here
+        compile_site_packages()
         
-        # Install requirements
-        subprocess.check_call([sys.executable, "-m", "pip", "install", "-r", "requirements.txt"])
         print("✅ All packages installed successfully!")
         return True
-    except subprocess.CalledProcessError as e:
+    except (subprocess.CalledProcessError, OSError) as e:
         print(f"❌ Error installing packages: {e}")
         print("\nTry running manually:")
         print("  pip install -r requirements.txt")
@@ -50,9 +174,26 @@ def download_nltk_data():
     print("\n📥 Downloading NLTK data...")
     try:
         import nltk
-        nltk.download('punkt', quiet=True)
-        nltk.download('stopwords', quiet=True)
-        nltk.download('vader_lexicon', quiet=True)
+        
+        missing = []
+        for package, resource in NLTK_RESOURCES.items():
+            try:
+                nltk.data.find(resource)
+            except LookupError:
+                missing.append(package)
+        
+        if not missing:
+            print("✅ NLTK data already available")
+            return True
+        
+        # One downloader session for every missing package, failing fast on a dead network
+        previous_timeout = socket.getdefaulttimeout()
+        socket.setdefaulttimeout(30)
+        try:
+            nltk.download(missing, quiet=True, raise_on_error=True)
+        finally:
+            socket.setdefaulttimeout(previous_timeout)
+        
         print("✅ NLTK data downloaded successfully!")
         return True
     except Exception as e:
@@ -60,66 +201,33 @@ def download_nltk_data():
         print("The app will download it on first run.")
         return True
 
+def write_chunks(path, chunks):
+    """Write pre-encoded byte chunks through a 1 MiB buffer and return the path"""
+    with open(path, 'wb', buffering=1 << 20) as f:
+        f.writelines(chunks)
+    return path
+
 def create_sample_data():
     """Create sample WhatsApp export files for testing"""
     print("\n📝 Creating sample data files...")
     
-    # Sample chat with reactions and media
-    sample_chat = """8/1/25, 9:00 AM - John Doe: Good morning everyone! 🌞
-8/1/25, 9:05 AM - Jane Smith: Morning John! How's everyone doing today?
-8/1/25, 9:10 AM - Bob Wilson: Great! Just finished breakfast 😊
-8/1/25, 9:15 AM - Alice Brown: Hey guys! Anyone up for coffee later? ☕
-8/1/25, 9:20 AM - John Doe: Count me in! 
-8/1/25, 9:25 AM - Jane Smith: <Media omitted>
-8/1/25, 9:26 AM - Bob Wilson: Nice photo Jane! Where is that?
-8/1/25, 9:27 AM - Jane Smith: Central Park this morning! Beautiful weather
-8/1/25, 10:00 AM - Alice Brown: Wow, gorgeous! 😍
-8/1/25, 10:30 AM - John Doe: So coffee at 3 PM? ☕
-8/1/25, 10:31 AM - Bob Wilson: Works for me 👍
-8/1/25, 10:32 AM - Jane Smith: Same here!
-8/1/25, 10:33 AM - Alice Brown: Perfect! See you all at the usual place
-8/1/25, 2:00 PM - John Doe: Running a bit late, be there by 3:15
-8/1/25, 2:01 PM - Jane Smith: No worries! We'll wait
-8/1/25, 3:00 PM - Bob Wilson: I'm here! Got us a table
-8/1/25, 3:05 PM - Alice Brown: On my way! 5 minutes
-8/1/25, 3:10 PM - Jane Smith: Just arrived! 
-8/1/25, 3:15 PM - John Doe: Here! Sorry for the delay
-8/1/25, 5:00 PM - Bob Wilson: That was fun! We should do this more often
-8/1/25, 5:01 PM - Alice Brown: Absolutely! Same time next week?
-8/1/25, 5:02 PM - Jane Smith: I'm in! 🎉
-8/1/25, 5:03 PM - John Doe: Me too! Thanks for today everyone
-8/2/25, 8:00 AM - Jane Smith: Good morning! Ready for another day? 💪
-8/2/25, 8:15 AM - Bob Wilson: Morning! Already at work
-8/2/25, 8:30 AM - John Doe: Morning all! Busy day ahead
-8/2/25, 8:45 AM - Alice Brown: Same here! Let's crush it today! 💯
-8/2/25, 12:00 PM - Jane Smith: Lunch break! What's everyone having?
-8/2/25, 12:05 PM - Bob Wilson: Sandwich and salad 🥗
-8/2/25, 12:10 PM - John Doe: Pizza day for me! 🍕
-8/2/25, 12:15 PM - Alice Brown: Sushi! 🍱
-8/2/25, 12:20 PM - Jane Smith: You all are making me hungry! 😂
-8/2/25, 6:00 PM - Bob Wilson: Heading home! Have a great evening everyone
-8/2/25, 6:05 PM - John Doe: You too Bob! See you tomorrow
-8/2/25, 6:10 PM - Alice Brown: Bye everyone! 👋
-8/2/25, 6:15 PM - Jane Smith: Have a good night all! 🌙"""
-    
     # Save sample files
-    files_created = []
-    
     try:
-        # Main sample file
-        with open('sample_chat.txt', 'w', encoding='utf-8') as f:
-            f.write(sample_chat)
-        files_created.append('sample_chat.txt')
-        
         # Create a larger sample for testing
-        large_sample = sample_chat
+        # Split on the two dates once; each copy then only swaps the date segments
+        segments = re.split(rb'(8/1/25|8/2/25)', SAMPLE_CHAT_BYTES)
+        large_chunks = [SAMPLE_CHAT_BYTES]
         for i in range(5):  # Repeat to create more data
-            large_sample += f"\n8/{i+3}/25, 10:00 AM - User{i}: Test message {i}\n"
-            large_sample += sample_chat.replace("8/1/25", f"8/{i+3}/25").replace("8/2/25", f"8/{i+4}/25")
+            new_dates = {b"8/1/25": f"8/{i+3}/25".encode(), b"8/2/25": f"8/{i+4}/25".encode()}
+            large_chunks.append(f"\n8/{i+3}/25, 10:00 AM - User{i}: Test message {i}\n".encode('utf-8'))
+            large_chunks.extend(new_dates.get(segment, segment) for segment in segments)
+        
+        samples = [('sample_chat.txt', [SAMPLE_CHAT_BYTES]), ('large_sample_chat.txt', large_chunks)]
         
-        with open('large_sample_chat.txt', 'w', encoding='utf-8') as f:
-            f.write(large_sample)
-        files_created.append('large_sample_chat.txt')
+        # The two files are independent, so write them concurrently
+        with ThreadPoolExecutor(max_workers=len(samples)) as executor:
+            futures = [executor.submit(write_chunks, path, chunks) for path, chunks in samples]
+            files_created = [future.result() for future in futures]
         
         print(f"✅ Created {len(files_created)} sample files:")
         for file in files_created:
@@ -138,8 +246,9 @@ def create_directories():
     dirs_to_create = ['reports', 'temp', 'exports']
     
     for dir_name in dirs_to_create:
-        if not os.path.exists(dir_name):
-            os.makedirs(dir_name)
+        created = not os.path.isdir(dir_name)
+        os.makedirs(dir_name, exist_ok=True)
+        if created:
             print(f"✅ Created directory: {dir_name}/")
         else:
             print(f"   Directory exists: {dir_name}/")
@@ -151,13 +260,9 @@ def test_installation():
     print("\n🧪 Testing installation...")
     
     try:
-        # Test imports
-        import pandas
-        import numpy
-        import plotly
-        import streamlit
-        import fastapi
-        import emoji
+        # Test imports; cold imports are dominated by file I/O, so load the packages concurrently
+        with ThreadPoolExecutor(max_workers=len(CORE_PACKAGES)) as executor:
+            list(executor.map(importlib.import_module, CORE_PACKAGES))
         
         print("✅ Core packages imported successfully")
         
@@ -183,50 +288,52 @@ def test_installation():
 
 def print_instructions():
     """Print usage instructions"""
-    print("\n" + "=" * 60)
-    print("📌 Setup Complete! Here's how to use the analyzer:")
-    print("=" * 60)
-    
-    print("\n🚀 Quick Start:")
-    print("-" * 40)
-    
+    windows_hint = ""
     if platform.system() == "Windows":
-        print("1. Double-click 'run.bat' for interactive menu")
-        print("   OR")
-    
-    print("2. Run Streamlit Dashboard:")
-    print("   streamlit run app.py")
-    print()
-    print("3. Run FastAPI Server:")
-    print("   python -m uvicorn api:app --reload")
-    print()
-    print("4. Run both simultaneously:")
-    print("   Terminal 1: streamlit run app.py")
-    print("   Terminal 2: python -m uvicorn api:app --reload")
-    
-    print("\n📱 Export WhatsApp Chat:")
-    print("-" * 40)
-    print("Android: Menu (⋮) → More → Export chat")
-    print("iOS: Contact name → Export Chat")
-    print("Choose 'Without media' for faster processing")
-    
-    print("\n📊 Sample Files Created:")
-    print("-" * 40)
-    print("• sample_chat.txt - Small sample for testing")
-    print("• large_sample_chat.txt - Larger dataset")
-    
-    print("\n🔗 Access Points:")
-    print("-" * 40)
-    print("• Streamlit: http://localhost:8501")
-    print("• API: http://localhost:8000")
-    print("• API Docs: http://localhost:8000/docs")
+        windows_hint = "1. Double-click 'run.bat' for interactive menu\n   OR\n"
     
-    print("\n💡 Tips:")
-    print("-" * 40)
-    print("• Use sample data to test features first")
-    print("• Export chats without media for faster processing")
-    print("• Check API docs for integration examples")
-    print("• Reports are saved in the 'reports' folder")
+    # Assembled into one string so the whole block goes out in a single write
+    sys.stdout.write(f"""
+{"=" * 60}
+📌 Setup Complete! Here's how to use the analyzer:
+{"=" * 60}
+
+🚀 Quick Start:
+{"-" * 40}
+{windows_hint}2. Run Streamlit Dashboard:
+   streamlit run app.py
+
+3. Run FastAPI Server:
+   python -m uvicorn api:app --reload
+
+4. Run both simultaneously:
+   Terminal 1: streamlit run app.py
+   Terminal 2: python -m uvicorn api:app --reload
+
+📱 Export WhatsApp Chat:
+{"-" * 40}
+Android: Menu (⋮) → More → Export chat
+iOS: Contact name → Export Chat
+Choose 'Without media' for faster processing
+
+📊 Sample Files Created:
+{"-" * 40}
+• sample_chat.txt - Small sample for testing
+• large_sample_chat.txt - Larger dataset
+
+🔗 Access Points:
+{"-" * 40}
+• Streamlit: http://localhost:8501
+• API: http://localhost:8000
+• API Docs: http://localhost:8000/docs
+
+💡 Tips:
+{"-" * 40}
+• Use sample data to test features first
+• Export chats without media for faster processing
+• Check API docs for integration examples
+• Reports are saved in the 'reports' folder
+""")
 
 def main():
     """Main setup function"""
@@ -4,34 +4,59 @@ Test script to verify all modules are working correctly
 
 import sys
 import traceback
+import importlib
+import importlib.util
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 
-def test_imports():
-    """Test if all required modules can be imported"""
+# Project modules and the entry point each one must expose
+CUSTOM_MODULES = [
+    ('parser', 'WhatsAppParser'),
+    ('analyzer', 'ChatAnalyzer'),
+    ('predictor', 'ChatPredictor'),
+    ('visualizer', 'ChatVisualizer'),
+    ('api', 'app'),
+    ('report_generator', 'ReportGenerator')
+]
+
+# Third-party packages the analyzer depends on
+REQUIRED_MODULES = (
+    'pandas',
+    'numpy',
+    'matplotlib',
+    'plotly',
+    'streamlit',
+    'fastapi',
+    'emoji',
+    'nltk',
+    'sklearn',
+    'wordcloud',
+    'vaderSentiment'
+)
+
+def test_imports(deep=False):
+    """Test if all required modules are installed (deep=True also imports them)"""
     print("Testing imports...")
-    modules_to_test = [
-        'pandas',
-        'numpy', 
-        'matplotlib',
-        'plotly',
-        'streamlit',
-        'fastapi',
-        'emoji',
-        'nltk',
-        'sklearn',
-        'wordcloud',
-        'vaderSentiment'
-    ]
     
+    lines = []
     failed = []
-    for module in modules_to_test:
+    for module in REQUIRED_MODULES:
         try:
-            __import__(module)
-            print(f"✅ {module}")
+            # find_spec on a top-level name only locates the package and runs none of its
+            # __init__ code; importing (--deep) pays for the full initialisation
+            if deep:
+                __import__(module)
+            elif importlib.util.find_spec(module) is None:
+                raise ImportError(module)
+            lines.append(f"✅ {module}")
         except ImportError:
-            print(f"❌ {module} - Not installed")
+            lines.append(f"❌ {module} - Not installed")
             failed.append(module)
     
+    # One write for the whole probe report instead of one per module
+    sys.stdout.write('\n'.join(lines) + '\n')
+    
     if failed:
         print(f"\n⚠️ Missing modules: {', '.join(failed)}")
         print("Run: pip install -r requirements.txt")
@@ -40,35 +65,44 @@ def test_imports():
     print("\n✅ All required modules installed!")
     return True
 
+def _probe_module(name, attr):
+    """Import a module in a worker process; return the traceback on failure"""
+    try:
+        getattr(importlib.import_module(name), attr)
+        return None
+    except Exception:
+        return traceback.format_exc()
+
 def test_custom_modules():
     """Test if custom modules can be imported"""
     print("\nTesting custom modules...")
     
     try:
-        from parser import WhatsAppParser
-        print("✅ parser.py")
-        
-        from analyzer import ChatAnalyzer
-        print("✅ analyzer.py")
-        
-        from predictor import ChatPredictor
-        print("✅ predictor.py")
-        
-        from visualizer import ChatVisualizer
-        print("✅ visualizer.py")
-        
-        from api import app
-        print("✅ api.py")
-        
-        from report_generator import ReportGenerator
-        print("✅ report_generator.py")
+        # Each module cold-starts its heavy dependencies in its own fresh interpreter, in parallel
+        names, attrs = zip(*CUSTOM_MODULES)
+        context = multiprocessing.get_context('spawn')
+        with ProcessPoolExecutor(max_workers=len(CUSTOM_MODULES), mp_context=context) as executor:
+            errors = list(executor.map(_probe_module, names, attrs))
+        
+        failed = []
+        for name, error in zip(names, errors):
+            if error is None:
+                print(f"✅ {name}.py")
+            else:
+                print(f"❌ {name}.py")
+                print(error)
+                failed.append(name)
+        
+        if failed:
+            print(f"\n❌ Error loading custom modules: {', '.join(failed)}")
+            return False
         
         print("\n✅ All custom modules loaded successfully!")
         return True
         
     except Exception as e:
         print(f"\n❌ Error loading custom modules: {e}")
-        traceback.print_exc()
+        sys.stderr.write(traceback.format_exc())
         return False
 
 def test_sample_parsing():
@@ -88,13 +122,9 @@ def test_sample_parsing():
 8/2/25, 2:35 PM - John Doe: Working on the WhatsApp analyzer project
 8/2/25, 2:40 PM - Alice Brown: Sounds interesting! 🎉"""
         
-        # Save to temp file
-        with open('test_chat.txt', 'w', encoding='utf-8') as f:
-            f.write(sample_data)
-        
-        # Parse
+        # Parse straight from memory, no temp file round-trip
         parser = WhatsAppParser()
-        df = parser.parse_chat('test_chat.txt')
+        df = parser.parse_text(sample_data)
         
         print(f"✅ Parsed {len(df)} messages")
         print(f"✅ Found {df['sender'].nunique()} participants")
@@ -115,16 +145,12 @@ def test_sample_parsing():
         
         print("✅ Predictor initialized")
         
-        # Clean up
-        import os
-        os.remove('test_chat.txt')
-        
         print("\n✅ Sample data test passed!")
         return True
         
     except Exception as e:
         print(f"\n❌ Sample data test failed: {e}")
-        traceback.print_exc()
+        sys.stderr.write(traceback.format_exc())
         return False
 
 def main():
@@ -136,7 +162,7 @@ def main():
     all_passed = True
     
     # Test imports
-    if not test_imports():
+    if not test_imports(deep='--deep' in sys.argv):
         all_passed = False
     
     # Test custom modules
@@ -2,24 +2,47 @@
 Test script to verify the auto-save functionality works
 """
 
-from parser import WhatsAppParser
+from _test_support import load_parsed_chat
 from analyzer import ChatAnalyzer
 from predictor import ChatPredictor
 from database_manager import DatabaseManager
 import pandas as pd
 from datetime import datetime
+from functools import lru_cache
 import os
+import sys
+import traceback
+
+# Heavy components are built on first use and shared by every test in this module
+@lru_cache(maxsize=None)
+def get_db_manager():
+    """Shared DatabaseManager instance"""
+    return DatabaseManager()
+
+@lru_cache(maxsize=None)
+def get_chat_df():
+    """Parsed sample_chat.txt, shared by the analyzer and predictor"""
+    return load_parsed_chat('sample_chat.txt')
+
+@lru_cache(maxsize=None)
+def get_analyzer():
+    """Shared ChatAnalyzer over the sample chat"""
+    return ChatAnalyzer(get_chat_df())
+
+@lru_cache(maxsize=None)
+def get_predictor():
+    """Shared ChatPredictor over the sample chat"""
+    return ChatPredictor(get_chat_df())
 
 def test_auto_save():
     print("🧪 Testing auto-save functionality...")
     
     try:
         # Initialize components
-        parser = WhatsAppParser()
-        db_manager = DatabaseManager()
+        db_manager = get_db_manager()
         
         print("📄 Parsing sample_chat.txt...")
-        df = parser.parse_chat('sample_chat.txt')
+        df = get_chat_df()
         
         if df is None or df.empty:
             print("❌ Failed to parse sample chat")
@@ -29,7 +52,7 @@ def test_auto_save():
         
         # Run analysis
         print("🔍 Running analysis...")
-        analyzer = ChatAnalyzer(df)
+        analyzer = get_analyzer()
         basic_stats = analyzer.get_basic_stats()
         
         analysis_results = {
@@ -39,7 +62,7 @@ def test_auto_save():
         }
         
         print("🤖 Running predictions...")
-        predictor = ChatPredictor(df)
+        predictor = get_predictor()
         predictions = predictor.get_prediction_summary()
         
         # Test auto-save
@@ -78,8 +101,7 @@ def test_auto_save():
             
     except Exception as e:
         print(f"❌ Test failed: {e}")
-        import traceback
-        traceback.print_exc()
+        sys.stderr.write(traceback.format_exc())
         return False
 
 def test_database_stats():
@@ -87,7 +109,7 @@ def test_database_stats():
     print("\n📊 Testing database stats...")
     
     try:
-        db_manager = DatabaseManager()
+        db_manager = get_db_manager()
         stats = db_manager.get_database_stats()
         
         print(f"✅ Database stats:")
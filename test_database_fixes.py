@@ -4,6 +4,7 @@ Test script to verify database loading fixes
 
 import sys
 import os
+import traceback
 import pandas as pd
 from datetime import datetime
 
@@ -45,9 +46,9 @@ def test_database_loading():
         print(f"DataFrame columns: {list(df.columns)}")
         print(f"DataFrame dtypes: {df.dtypes}")
         
-        # Check user_stats type
-        if 'user_stats' in analysis_results:
-            user_stats = analysis_results['user_stats']
+        # Check user_stats type; a restored DataFrame is used as-is, never rebuilt
+        user_stats = analysis_results.get('user_stats')
+        if user_stats is not None:
             print(f"✅ user_stats type: {type(user_stats)}")
             
             if isinstance(user_stats, pd.DataFrame):
@@ -55,8 +56,8 @@ def test_database_loading():
                 print(f"user_stats columns: {list(user_stats.columns)}")
             elif isinstance(user_stats, dict):
                 print(f"⚠️ user_stats is still dict, but can be converted")
-                # Test conversion
-                user_stats_df = pd.DataFrame(user_stats)
+                # Legacy sessions stored DataFrame.to_dict(), which is keyed by column
+                user_stats_df = pd.DataFrame.from_dict(user_stats, orient='columns')
                 print(f"✅ Converted to DataFrame with {len(user_stats_df)} rows")
             else:
                 print(f"❌ user_stats is unexpected type: {type(user_stats)}")
@@ -75,8 +76,7 @@ def test_database_loading():
         
     except Exception as e:
         print(f"❌ Error during loading: {e}")
-        import traceback
-        traceback.print_exc()
+        sys.stderr.write(traceback.format_exc())
         return False
 
 if __name__ == "__main__":
@@ -3,13 +3,29 @@ Test script for the updated WhatsApp parser
 Tests iOS and Android formats including Arabic text
 """
 
-from parser import WhatsAppParser
+import re
+
+from _test_support import load_parsed_chat
 from analyzer import ChatAnalyzer
-import pandas as pd
 
-def test_parser():
-    parser = WhatsAppParser()
+# Compiled once at import rather than on every str.contains call
+ARABIC_PATTERN = re.compile('Arabic|مرحبا|أهلاً|الحمد')
+
+def report_response_times(user_stats):
+    """Print each user's average response time; return (positive, negative) counts"""
+    times = user_stats['avg_response_time_minutes']
+    valid = times.notna()
+    negative = valid & (times < 0)
     
+    for user, minutes, is_negative in zip(user_stats.loc[valid, 'user'], times[valid], negative[valid]):
+        if is_negative:
+            print(f"   ❌ Negative response time for {user}: {minutes}")
+        else:
+            print(f"   ✅ Positive response time for {user}: {minutes:.2f} minutes")
+    
+    return int((valid & ~negative).sum()), int(negative.sum())
+
+def test_parser():
     print("="*60)
     print("TESTING WHATSAPP PARSER FIXES")
     print("="*60)
@@ -18,7 +34,7 @@ def test_parser():
     print("\n1. Testing iOS Format:")
     print("-" * 30)
     try:
-        df_ios = parser.parse_chat('test_ios_chat.txt')
+        df_ios = load_parsed_chat('test_ios_chat.txt')
         print(f"✅ iOS format parsed successfully!")
         print(f"   Messages found: {len(df_ios)}")
         print(f"   Participants: {df_ios['sender'].nunique()}")
@@ -31,12 +47,7 @@ def test_parser():
         print(f"   User stats generated: {len(user_stats)} users")
         
         # Check for negative response times
-        for _, user in user_stats.iterrows():
-            if pd.notna(user['avg_response_time_minutes']):
-                if user['avg_response_time_minutes'] < 0:
-                    print(f"   ❌ Negative response time found for {user['user']}: {user['avg_response_time_minutes']}")
-                else:
-                    print(f"   ✅ Positive response time for {user['user']}: {user['avg_response_time_minutes']:.2f} minutes")
+        report_response_times(user_stats)
         
     except Exception as e:
         print(f"❌ iOS format failed: {e}")
@@ -45,7 +56,7 @@ def test_parser():
     print("\n2. Testing Android Format with Arabic:")
     print("-" * 40)
     try:
-        df_android = parser.parse_chat('test_android_arabic_chat.txt')
+        df_android = load_parsed_chat('test_android_arabic_chat.txt')
         print(f"✅ Android with Arabic parsed successfully!")
         print(f"   Messages found: {len(df_android)}")
         print(f"   Participants: {df_android['sender'].nunique()}")
@@ -53,7 +64,7 @@ def test_parser():
         print(f"   Sample senders: {list(df_android['sender'].unique())}")
         
         # Check Arabic text handling
-        arabic_messages = df_android[df_android['message'].str.contains('Arabic|مرحبا|أهلاً|الحمد', na=False, regex=True)]
+        arabic_messages = df_android[df_android['message'].str.contains(ARABIC_PATTERN, na=False)]
         print(f"   Arabic messages detected: {len(arabic_messages)}")
         
         # Test response time calculation
@@ -62,16 +73,7 @@ def test_parser():
         print(f"   User stats generated: {len(user_stats)} users")
         
         # Check for negative response times
-        negative_times = 0
-        positive_times = 0
-        for _, user in user_stats.iterrows():
-            if pd.notna(user['avg_response_time_minutes']):
-                if user['avg_response_time_minutes'] < 0:
-                    negative_times += 1
-                    print(f"   ❌ Negative response time for {user['user']}: {user['avg_response_time_minutes']}")
-                else:
-                    positive_times += 1
-                    print(f"   ✅ Positive response time for {user['user']}: {user['avg_response_time_minutes']:.2f} minutes")
+        positive_times, negative_times = report_response_times(user_stats)
         
         print(f"   Response time summary: {positive_times} positive, {negative_times} negative")
         
@@ -82,7 +84,7 @@ def test_parser():
     print("\n3. Testing Sample Data:")
     print("-" * 25)
     try:
-        df_sample = parser.parse_chat('sample_chat.txt')
+        df_sample = load_parsed_chat('sample_chat.txt')
         print(f"✅ Sample data parsed successfully!")
         print(f"   Messages found: {len(df_sample)}")
         print(f"   Participants: {df_sample['sender'].nunique()}")
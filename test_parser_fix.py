@@ -2,14 +2,13 @@
 Quick test to verify the parser fixes
 """
 
-from parser import WhatsAppParser
+from _test_support import load_parsed_chat
 
 def quick_test():
     print("🧪 Testing parser fixes...")
     
     try:
-        parser = WhatsAppParser()
-        df = parser.parse_chat('sample_chat.txt')
+        df = load_parsed_chat('sample_chat.txt')
         
         if df is not None and not df.empty:
             print(f"✅ SUCCESS! Parsed {len(df)} messages")
@@ -2,7 +2,10 @@
 Simple verification test to check parser works with sample data
 """
 
-from parser import WhatsAppParser
+import sys
+import traceback
+
+from _test_support import load_parsed_chat
 from analyzer import ChatAnalyzer
 
 def test_sample_chat():
@@ -10,8 +13,7 @@ def test_sample_chat():
     print("🧪 Testing parser with sample_chat.txt...")
     
     try:
-        parser = WhatsAppParser()
-        df = parser.parse_chat('sample_chat.txt')
+        df = load_parsed_chat('sample_chat.txt')
         
         if df is not None and not df.empty:
             print(f"✅ Sample parsing successful! {len(df)} messages")
@@ -33,8 +35,7 @@ def test_sample_chat():
             
     except Exception as e:
         print(f"❌ Sample parsing failed: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        sys.stderr.write(traceback.format_exc())
         return False
 
 def test_generated_format():
@@ -42,19 +43,24 @@ def test_generated_format():
     print("\n🔧 Testing generated message format...")
     
     from datetime import datetime, timedelta
-    import random
+    import numpy as np
     
     # Generate a few test messages like the performance_test does
     users = ['John Doe', 'Jane Smith']
     messages = ['Hello everyone!', 'Good morning! ☀️']
     start_date = datetime(2025, 8, 1)
     
-    for i in range(5):
-        days_offset = random.randint(0, 30)
-        hours_offset = random.randint(8, 22)
-        minutes_offset = random.randint(0, 59)
-        
-        timestamp = start_date + timedelta(days=days_offset, hours=hours_offset, minutes=minutes_offset)
+    # Draw every random value up front in vectorized calls; the loop only formats
+    count = 5
+    rng = np.random.default_rng()
+    days = rng.integers(0, 31, count)
+    hours = rng.integers(8, 23, count)
+    minutes = rng.integers(0, 60, count)
+    user_idx = rng.integers(0, len(users), count)
+    message_idx = rng.integers(0, len(messages), count)
+    
+    for i in range(count):
+        timestamp = start_date + timedelta(days=int(days[i]), hours=int(hours[i]), minutes=int(minutes[i]))
         
         # Format to match exact sample_chat.txt format
         month = timestamp.month
@@ -78,8 +84,8 @@ def test_generated_format():
             ampm = 'PM'
         
         timestamp_str = f"{month}/{day}/{year}, {hour_12}:{minute:02d} {ampm}"
-        user = random.choice(users)
-        message = random.choice(messages)
+        user = users[user_idx[i]]
+        message = messages[message_idx[i]]
         
         test_line = f"{timestamp_str} - {user}: {message}"
         print(f"Generated: {test_line}")
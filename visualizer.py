@@ -5,79 +5,152 @@ Creates interactive visualizations using Plotly
 
 import plotly.graph_objects as go
 import plotly.express as px
-from plotly.subplots import make_subplots
+import plotly.io as pio
 import pandas as pd
 import numpy as np
-from wordcloud import WordCloud
+import ast
+import re
 import base64
 from io import BytesIO
-import matplotlib.pyplot as plt
-import seaborn as sns
-from datetime import datetime, timedelta
-import colorsys
+from functools import partial
+from concurrent.futures import ThreadPoolExecutor
+
+# Heatmap axis labels, shared by every chart render
+DAY_NAMES = ('Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday')
+HOUR_LABELS = tuple(f"{h:02d}:00" for h in range(24))
+
+# Resolved once; assigning the Template object skips the by-name lookup per chart
+PLOT_TEMPLATE = pio.templates['plotly_white']
+
+# Daily timelines longer than this are downsampled before being sent to the browser
+MAX_TIMELINE_POINTS = 3000
+
+def lttb_indices(x, y, n_out):
+    """Indices kept by Largest-Triangle-Three-Buckets downsampling of (x, y)"""
+    n = len(y)
+    if n <= n_out or n_out < 3:
+        return np.arange(n)
+    
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    
+    # First and last points are always kept; the rest is split into n_out - 2 buckets
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    keep = np.empty(n_out, dtype=np.int64)
+    keep[0], keep[-1] = 0, n - 1
+    
+    a = 0
+    for i in range(n_out - 2):
+        lo, hi = edges[i], edges[i + 1]
+        # The mean of the next bucket (the last point, at the end) is the third vertex
+        next_hi = edges[i + 2] if i + 2 < len(edges) else n
+        cx, cy = x[hi:next_hi].mean(), y[hi:next_hi].mean()
+        area = np.abs((x[a] - cx) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (cy - y[a]))
+        a = lo + int(area.argmax())
+        keep[i + 1] = a
+    
+    return keep
 
 class ChatVisualizer:
+    # Row of each weekday in the 7x24 heatmaps
+    DAY_TO_IDX = {day: i for i, day in enumerate(DAY_NAMES)}
+    
+    # One "('🙏', 9)" pair as stringified by older saved sessions
+    EMOJI_PAIR_RE = re.compile(r"\((['\"].+?['\"])\s*,\s*(\d+)\)")
+    
     def __init__(self, df, analysis_results):
         self.df = df
         self.analysis = analysis_results
         self.color_palette = px.colors.qualitative.Plotly
         
+        # Messages per calendar day, aggregated once and sliced by every timeline chart
+        days = pd.to_datetime(df['date']).to_numpy(dtype='datetime64[D]')
+        daily = df.groupby(days).size()
+        self._daily_dates = daily.index.to_numpy(dtype='datetime64[ns]')
+        self._daily_counts = daily.to_numpy().astype(np.int32)
+        
+        # Sessions restored from the database may hand user_stats over as a dict
+        user_stats = analysis_results.get('user_stats')
+        if isinstance(user_stats, dict):
+            user_stats = pd.DataFrame(user_stats)
+        self._user_stats_df = user_stats
+        
+    @staticmethod
+    def _rolling_mean(values, window):
+        """Trailing mean with min_periods=1, as a single convolution"""
+        values = np.asarray(values, dtype=np.float64)
+        if len(values) == 0:
+            return values
+        sums = np.convolve(values, np.ones(window), mode='full')[:len(values)]
+        return sums / np.minimum(np.arange(1, len(values) + 1), window)
+    
+    @staticmethod
+    def _scatter_7x24(days, hours, values):
+        """Sum values into a day x hour grid with one bincount over flat slot ids"""
+        values = np.asarray(values)
+        slots = np.asarray(days, dtype=np.intp) * 24 + np.asarray(hours, dtype=np.intp)
+        grid = np.bincount(slots, weights=values, minlength=7 * 24)
+        return grid.astype(values.dtype, copy=False).reshape(7, 24)
+    
+    @staticmethod
+    def _empty_figure(message, height=400):
+        """Placeholder figure with a centred message, for charts without enough data"""
+        # Built fresh every time: figures are mutable and outlive the call in Streamlit,
+        # and cloning a cached one costs more than this single constructor call
+        return go.Figure(layout=dict(
+            annotations=[dict(text=message, xref="paper", yref="paper", x=0.5, y=0.5, showarrow=False)],
+            height=height
+        ))
+    
     def create_monthly_timeline(self):
         """Create interactive timeline of messages aggregated by month"""
 
-        # Ensure 'date' is datetime
-        df_copy = self.df.copy()
-        df_copy['date'] = pd.to_datetime(df_copy['date'])
-
-        # Aggregate messages by month
-        monthly_counts = (
-            df_copy
-            .groupby(df_copy['date'].dt.to_period("M"))
-            .size()
-            .reset_index(name='count')
-        )
-        monthly_counts['date'] = monthly_counts['date'].dt.to_timestamp()
+        # Fold the (sorted) daily counts into months, keyed by integer datetime64[M]
+        # codes instead of Period objects
+        months, starts = np.unique(self._daily_dates.astype('datetime64[M]'), return_index=True)
+        monthly_counts = pd.DataFrame({
+            'date': months.astype('datetime64[ns]'),
+            'count': np.add.reduceat(self._daily_counts, starts)
+        })
 
         # Rolling average (3 months for smoother trends)
-        monthly_counts['rolling_avg'] = (
-            monthly_counts['count']
-            .rolling(window=3, min_periods=1)
-            .mean()
-        )
-
-        # Create figure
-        fig = go.Figure()
+        monthly_counts['rolling_avg'] = self._rolling_mean(monthly_counts['count'].to_numpy(), 3)
 
-        # Bar for total messages each month
-        fig.add_trace(go.Bar(
-            x=monthly_counts['date'],
-            y=monthly_counts['count'],
-            name='Messages',
-            marker=dict(color='rgba(31, 119, 180, 0.6)'),
-            hovertemplate='<b>Month:</b> %{x|%b %Y}<br><b>Messages:</b> %{y}<extra></extra>'
-        ))
-
-        # Rolling average line
-        fig.add_trace(go.Scatter(
-            x=monthly_counts['date'],
-            y=monthly_counts['rolling_avg'],
-            mode='lines+markers',
-            name='3-Month Average',
-            line=dict(color='#ff7f0e', width=2, dash='dash'),
-            marker=dict(size=6),
-            hovertemplate='<b>Month:</b> %{x|%b %Y}<br><b>Avg:</b> %{y:.1f}<extra></extra>'
-        ))
-
-        # Fancy layout
-        fig.update_layout(
-            title='📅 Monthly Message Timeline',
-            xaxis_title='Month',
-            yaxis_title='Number of Messages',
-            hovermode='x unified',
-            showlegend=True,
-            height=500,
-            template='plotly_white',
-            bargap=0.2
+        # Traces get plain ndarrays: Plotly encodes datetime64 arrays in bulk, while a
+        # datetime Series goes through its per-Timestamp conversion path.
+        # Traces and layout are passed to the constructor so the figure is validated once
+        fig = go.Figure(
+            data=[
+                # Bar for total messages each month
+                go.Bar(
+                    x=monthly_counts['date'].to_numpy(),
+                    y=monthly_counts['count'].to_numpy(),
+                    name='Messages',
+                    marker=dict(color='rgba(31, 119, 180, 0.6)'),
+                    hovertemplate='<b>Month:</b> %{x|%b %Y}<br><b>Messages:</b> %{y}<extra></extra>'
+                ),
+                # Rolling average line
+                go.Scattergl(
+                    x=monthly_counts['date'].to_numpy(),
+                    y=monthly_counts['rolling_avg'].to_numpy(),
+                    mode='lines+markers',
+                    name='3-Month Average',
+                    line=dict(color='#ff7f0e', width=2, dash='dash'),
+                    marker=dict(size=6),
+                    hovertemplate='<b>Month:</b> %{x|%b %Y}<br><b>Avg:</b> %{y:.1f}<extra></extra>'
+                )
+            ],
+            # Fancy layout
+            layout=dict(
+                template=PLOT_TEMPLATE,
+                title='📅 Monthly Message Timeline',
+                xaxis_title='Month',
+                yaxis_title='Number of Messages',
+                hovermode='x unified',
+                showlegend=True,
+                height=500,
+                bargap=0.2
+            )
         )
 
         return fig
@@ -85,13 +158,19 @@ class ChatVisualizer:
     def create_message_timeline(self):
         """Create interactive timeline of messages"""
         
-        daily_counts = self.df.groupby('date').size().reset_index(name='count')
+        daily_counts = pd.DataFrame({'date': self._daily_dates, 'count': self._daily_counts})
+        
+        # Average over the full series, then thin out long multi-year timelines
+        daily_counts['rolling_avg'] = self._rolling_mean(self._daily_counts, 7)
+        if len(daily_counts) > MAX_TIMELINE_POINTS:
+            keep = lttb_indices(self._daily_dates.view('int64'), self._daily_counts, MAX_TIMELINE_POINTS)
+            daily_counts = daily_counts.iloc[keep]
         
         fig = go.Figure()
         
-        fig.add_trace(go.Scatter(
-            x=daily_counts['date'],
-            y=daily_counts['count'],
+        fig.add_trace(go.Scattergl(
+            x=daily_counts['date'].to_numpy(),
+            y=daily_counts['count'].to_numpy(),
             mode='lines+markers',
             name='Daily Messages',
             line=dict(color='#1f77b4', width=2),
@@ -100,25 +179,23 @@ class ChatVisualizer:
         ))
         
         # Add rolling average
-        daily_counts['rolling_avg'] = daily_counts['count'].rolling(window=7, min_periods=1).mean()
-        
-        fig.add_trace(go.Scatter(
-            x=daily_counts['date'],
-            y=daily_counts['rolling_avg'],
+        fig.add_trace(go.Scattergl(
+            x=daily_counts['date'].to_numpy(),
+            y=daily_counts['rolling_avg'].to_numpy(),
             mode='lines',
             name='7-day Average',
             line=dict(color='#ff7f0e', width=2, dash='dash'),
             hovertemplate='<b>Date:</b> %{x}<br><b>7-day Avg:</b> %{y:.1f}<extra></extra>'
         ))
         
+        fig.layout.template = PLOT_TEMPLATE
         fig.update_layout(
             title='Message Timeline',
             xaxis_title='Date',
             yaxis_title='Number of Messages',
             hovermode='x unified',
             showlegend=True,
-            height=500,
-            template='plotly_white'
+            height=500
         )
         
         return fig
@@ -126,74 +203,77 @@ class ChatVisualizer:
     def create_user_activity_chart(self):
         """Create interactive user activity chart"""
         
-        user_stats = self.analysis['user_stats']
-        
-        # Ensure user_stats is a DataFrame
-        if isinstance(user_stats, dict):
-            user_stats = pd.DataFrame(user_stats)
-        
-        fig = make_subplots(
-            rows=2, cols=2,
-            subplot_titles=('Messages by User', 'Words by User', 
-                          'Emojis by User', 'Media Shared'),
-            specs=[[{'type': 'bar'}, {'type': 'bar'}],
-                   [{'type': 'bar'}, {'type': 'bar'}]]
-        )
-        
-        # Messages
-        fig.add_trace(
-            go.Bar(
-                x=user_stats['user'].tolist() if hasattr(user_stats['user'], 'tolist') else list(user_stats['user']),
-                y=user_stats['message_count'].tolist() if hasattr(user_stats['message_count'], 'tolist') else list(user_stats['message_count']),
-                name='Messages',
-                marker_color='#1f77b4',
-                hovertemplate='<b>%{x}</b><br>Messages: %{y}<extra></extra>'
-            ),
-            row=1, col=1
-        )
-        
-        # Words
-        fig.add_trace(
-            go.Bar(
-                x=user_stats['user'].tolist() if hasattr(user_stats['user'], 'tolist') else list(user_stats['user']),
-                y=user_stats['word_count'].tolist() if hasattr(user_stats['word_count'], 'tolist') else list(user_stats['word_count']),
-                name='Words',
-                marker_color='#ff7f0e',
-                hovertemplate='<b>%{x}</b><br>Words: %{y}<extra></extra>'
-            ),
-            row=1, col=2
-        )
-        
-        # Emojis
-        fig.add_trace(
-            go.Bar(
-                x=user_stats['user'].tolist() if hasattr(user_stats['user'], 'tolist') else list(user_stats['user']),
-                y=user_stats['emoji_count'].tolist() if hasattr(user_stats['emoji_count'], 'tolist') else list(user_stats['emoji_count']),
-                name='Emojis',
-                marker_color='#2ca02c',
-                hovertemplate='<b>%{x}</b><br>Emojis: %{y}<extra></extra>'
-            ),
-            row=2, col=1
-        )
-        
-        # Media
-        fig.add_trace(
-            go.Bar(
-                x=user_stats['user'].tolist() if hasattr(user_stats['user'], 'tolist') else list(user_stats['user']),
-                y=user_stats['media_count'].tolist() if hasattr(user_stats['media_count'], 'tolist') else list(user_stats['media_count']),
-                name='Media',
-                marker_color='#d62728',
-                hovertemplate='<b>%{x}</b><br>Media: %{y}<extra></extra>'
-            ),
-            row=2, col=2
-        )
-        
-        fig.update_xaxes(tickangle=45)
-        fig.update_layout(
-            height=700,
-            showlegend=False,
-            title_text="User Activity Analysis",
-            template='plotly_white'
+        user_stats = self._user_stats_df
+        
+        # Names are shared by the four panels; counts stay ndarrays, which Plotly
+        # encodes without boxing every element (string labels encode faster as a list)
+        users = user_stats['user'].tolist()
+        msg, wrd, emj, med = (user_stats[c].to_numpy() for c in ('message_count', 'word_count', 'emoji_count', 'media_count'))
+        
+        # Panel titles sit centred above each cell of the 2x2 grid
+        titles = [
+            dict(text=text, x=x, y=y, xref='paper', yref='paper', xanchor='center',
+                 yanchor='bottom', showarrow=False, font=dict(size=16))
+            for text, x, y in (('Messages by User', 0.225, 1.0), ('Words by User', 0.775, 1.0),
+                               ('Emojis by User', 0.225, 0.375), ('Media Shared', 0.775, 0.375))
+        ]
+        
+        # The grid is laid out directly, so the figure is validated once rather than
+        # through make_subplots plus one add_trace per panel
+        fig = go.Figure(
+            data=[
+                # Messages
+                go.Bar(
+                    x=users,
+                    y=msg,
+                    name='Messages',
+                    marker_color='#1f77b4',
+                    hovertemplate='<b>%{x}</b><br>Messages: %{y}<extra></extra>',
+                    xaxis='x', yaxis='y'
+                ),
+                # Words
+                go.Bar(
+                    x=users,
+                    y=wrd,
+                    name='Words',
+                    marker_color='#ff7f0e',
+                    hovertemplate='<b>%{x}</b><br>Words: %{y}<extra></extra>',
+                    xaxis='x2', yaxis='y2'
+                ),
+                # Emojis
+                go.Bar(
+                    x=users,
+                    y=emj,
+                    name='Emojis',
+                    marker_color='#2ca02c',
+                    hovertemplate='<b>%{x}</b><br>Emojis: %{y}<extra></extra>',
+                    xaxis='x3', yaxis='y3'
+                ),
+                # Media
+                go.Bar(
+                    x=users,
+                    y=med,
+                    name='Media',
+                    marker_color='#d62728',
+                    hovertemplate='<b>%{x}</b><br>Media: %{y}<extra></extra>',
+                    xaxis='x4', yaxis='y4'
+                )
+            ],
+            layout=dict(
+                xaxis=dict(anchor='y', domain=[0.0, 0.45], tickangle=45),
+                yaxis=dict(anchor='x', domain=[0.625, 1.0]),
+                xaxis2=dict(anchor='y2', domain=[0.55, 1.0], tickangle=45),
+                yaxis2=dict(anchor='x2', domain=[0.625, 1.0]),
+                xaxis3=dict(anchor='y3', domain=[0.0, 0.45], tickangle=45),
+                yaxis3=dict(anchor='x3', domain=[0.0, 0.375]),
+                xaxis4=dict(anchor='y4', domain=[0.55, 1.0], tickangle=45),
+                yaxis4=dict(anchor='x4', domain=[0.0, 0.375]),
+                annotations=titles,
+                template=PLOT_TEMPLATE,
+                height=700,
+                showlegend=False,
+                title_text="User Activity Analysis"
+            )
         )
         
         return fig
@@ -203,90 +283,76 @@ class ChatVisualizer:
         
         heatmap_data = self.analysis['temporal_analysis']['heatmap_data']
         
-        # Prepare data for heatmap
-        days = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
-        hours = list(range(24))
-        
-        z_values = []
-        for day in days:
-            day_values = []
-            for hour in hours:
-                value = next((item['count'] for item in heatmap_data 
-                            if item['day'] == day and item['hour'] == hour), 0)
-                day_values.append(value)
-            z_values.append(day_values)
+        # Scatter every (day, hour, count) record into the grid in one pass
+        n = len(heatmap_data)
+        days_arr = np.fromiter((self.DAY_TO_IDX[item['day']] for item in heatmap_data), dtype=np.int8, count=n)
+        hours_arr = np.fromiter((item['hour'] for item in heatmap_data), dtype=np.int8, count=n)
+        counts = np.fromiter((item['count'] for item in heatmap_data), dtype=np.int32, count=n)
+        z_values = self._scatter_7x24(days_arr, hours_arr, counts)
         
         fig = go.Figure(data=go.Heatmap(
             z=z_values,
-            x=[f"{h:02d}:00" for h in hours],
-            y=days,
+            x=HOUR_LABELS,
+            y=DAY_NAMES,
             colorscale='Viridis',
             hovertemplate='<b>%{y}</b><br>Time: %{x}<br>Messages: %{z}<extra></extra>'
         ))
         
+        fig.layout.template = PLOT_TEMPLATE
         fig.update_layout(
             title='Activity Heatmap - Messages by Day and Hour',
             xaxis_title='Hour of Day',
             yaxis_title='Day of Week',
-            height=400,
-            template='plotly_white'
+            height=400
         )
         
         return fig
     
     def create_emoji_chart(self):
         """Create emoji usage chart"""
-        import ast
         emoji_data = self.analysis['emoji_analysis']
-        top_emojis_raw = emoji_data['top_emojis'][:15]
-        top_emojis = []
-        if top_emojis_raw:
-        # Safely convert each string "(emoji, count)" into a tuple
-            for item in top_emojis_raw:
-                try:
-                    tup = ast.literal_eval(item)  # ('🙏', 9)
-                    if isinstance(tup, tuple) and len(tup) == 2:
-                        top_emojis.append(tup)
-                except Exception:
-                    continue
-
-            # Now split into lists
+        top_emojis = emoji_data['top_emojis'][:15]
+        
+        # Fresh analyses hold (emoji, count) pairs; legacy sessions hold their str() form,
+        # pulled apart with one regex scan (only escaped literals need evaluating)
+        if top_emojis and isinstance(top_emojis[0], str):
+            top_emojis = [
+                (ast.literal_eval(literal) if '\\' in literal else literal[1:-1], int(count))
+                for literal, count in self.EMOJI_PAIR_RE.findall(' '.join(top_emojis))
+            ]
+        
+        if top_emojis:
+            # Labels stay a list; counts become a typed int array. The hovertemplate reads
+            # both straight from x/y, so no duplicate customdata block is shipped
             emojis = [t[0] for t in top_emojis]
-            counts = [t[1] for t in top_emojis]
+            counts = np.fromiter((t[1] for t in top_emojis), dtype=np.int64, count=len(top_emojis))
 
-            print("emojis", emojis)
-            print("counts", counts)
-            fig = go.Figure(data=[
-                go.Bar(
-                    x=counts,
-                    y=emojis,
-                    orientation='h',
-                    # marker=dict(
-                    #     color=counts,
-                    #     colorscale='Viridis',
-                    #     showscale=False
-                    # ),
-                    marker=dict(color="#1f77b4"),
-                    hovertemplate='<b>%{y}</b><br>Count: %{x}<extra></extra>'
+            fig = go.Figure(
+                data=[
+                    go.Bar(
+                        x=counts,
+                        y=emojis,
+                        orientation='h',
+                        # marker=dict(
+                        #     color=counts,
+                        #     colorscale='Viridis',
+                        #     showscale=False
+                        # ),
+                        marker=dict(color="#1f77b4"),
+                        hovertemplate='<b>%{y}</b><br>Count: %{x}<extra></extra>'
+                    )
+                ],
+                layout=dict(
+                    template=PLOT_TEMPLATE,
+                    title='Top 15 Most Used Emojis',
+                    xaxis_title='Usage Count',
+                    yaxis_title='Emoji',
+                    height=500,
+                    yaxis=dict(tickfont=dict(size=20))
                 )
-            ])
-            
-            fig.update_layout(
-                title='Top 15 Most Used Emojis',
-                xaxis_title='Usage Count',
-                yaxis_title='Emoji',
-                height=500,
-                template='plotly_white',
-                yaxis=dict(tickfont=dict(size=20))
             )
         else:
-            fig = go.Figure()
-            fig.add_annotation(
-                text="No emojis found in chat",
-                xref="paper", yref="paper",
-                x=0.5, y=0.5, showarrow=False
-            )
-            fig.update_layout(height=400)
+            fig = self._empty_figure("No emojis found in chat")
         
         return fig
     
@@ -296,6 +362,9 @@ class ChatVisualizer:
         word_freq = self.analysis['word_analysis']['word_frequency']
         
         if word_freq:
+            # wordcloud drags in matplotlib and PIL; only pay for it when a cloud is drawn
+            from wordcloud import WordCloud
+            
             # Generate word cloud
             wordcloud = WordCloud(
                 width=800, 
@@ -305,17 +374,10 @@ class ChatVisualizer:
                 max_words=100
             ).generate_from_frequencies(word_freq)
             
-            # Convert to base64 for display
+            # Encode the rendered bitmap straight to PNG; no matplotlib figure needed
             img = BytesIO()
-            plt.figure(figsize=(12, 6))
-            plt.imshow(wordcloud, interpolation='bilinear')
-            plt.axis('off')
-            plt.tight_layout(pad=0)
-            plt.savefig(img, format='png', bbox_inches='tight', dpi=100)
-            plt.close()
-            
-            img.seek(0)
-            encoded = base64.b64encode(img.read()).decode()
+            wordcloud.to_image().save(img, format='PNG', compress_level=1)
+            encoded = base64.b64encode(img.getvalue()).decode()
             
             return f"data:image/png;base64,{encoded}"
         
@@ -325,92 +387,86 @@ class ChatVisualizer:
         """Create sentiment analysis timeline"""
         
         sentiment_data = self.analysis['sentiment_analysis']['sentiment_over_time']
-        print("sentiment_data", sentiment_data)
         if sentiment_data:
             df_sentiment = pd.DataFrame(sentiment_data)
             
-            fig = go.Figure()
-            
-            fig.add_trace(go.Scatter(
-                x=df_sentiment['date'],
-                y=df_sentiment['compound'],
-                mode='lines+markers',
-                name='Sentiment Score',
-                line=dict(color='#1f77b4', width=2),
-                marker=dict(size=6),
-                hovertemplate='<b>Date:</b> %{x}<br><b>Sentiment:</b> %{y:.3f}<extra></extra>'
-            ))
-            
-            # Add zero line
-            fig.add_hline(y=0, line_dash="dash", line_color="gray", opacity=0.5)
-            
-            # Add colored regions
-            fig.add_hrect(y0=0, y1=1, fillcolor="green", opacity=0.1)
-            fig.add_hrect(y0=-1, y1=0, fillcolor="red", opacity=0.1)
+            # The zero line and shaded regions are plain layout shapes, built together
+            # with the trace in one constructor call instead of add_hline/add_hrect
+            shapes = [
+                # Zero line
+                dict(type='line', xref='x domain', yref='y', x0=0, x1=1, y0=0, y1=0,
+                     line=dict(color='gray', dash='dash'), opacity=0.5),
+                # Colored regions
+                dict(type='rect', xref='x domain', yref='y', x0=0, x1=1, y0=0, y1=1,
+                     fillcolor='green', opacity=0.1),
+                dict(type='rect', xref='x domain', yref='y', x0=0, x1=1, y0=-1, y1=0,
+                     fillcolor='red', opacity=0.1)
+            ]
             
-            fig.update_layout(
-                title='Sentiment Analysis Over Time',
-                xaxis_title='Date',
-                yaxis_title='Sentiment Score',
-                yaxis=dict(range=[-1, 1]),
-                height=400,
-                template='plotly_white'
+            fig = go.Figure(
+                data=[go.Scattergl(
+                    x=df_sentiment['date'],
+                    y=df_sentiment['compound'],
+                    mode='lines+markers',
+                    name='Sentiment Score',
+                    line=dict(color='#1f77b4', width=2),
+                    marker=dict(size=6),
+                    hovertemplate='<b>Date:</b> %{x}<br><b>Sentiment:</b> %{y:.3f}<extra></extra>'
+                )],
+                layout=dict(
+                    template=PLOT_TEMPLATE,
+                    shapes=shapes,
+                    title='Sentiment Analysis Over Time',
+                    xaxis_title='Date',
+                    yaxis_title='Sentiment Score',
+                    yaxis=dict(range=[-1, 1]),
+                    height=400
+                )
             )
         else:
-            fig = go.Figure()
-            fig.add_annotation(
-                text="Insufficient data for sentiment analysis",
-                xref="paper", yref="paper",
-                x=0.5, y=0.5, showarrow=False
-            )
-            fig.update_layout(height=400)
+            fig = self._empty_figure("Insufficient data for sentiment analysis")
         
         return fig
     
     def create_response_time_chart(self):
         """Create response time analysis chart"""
         
-        user_stats = self.analysis['user_stats']
-        
-        # Ensure user_stats is a DataFrame
-        if isinstance(user_stats, dict):
-            user_stats = pd.DataFrame(user_stats)
+        user_stats = self._user_stats_df
         
         # Filter users with response time data
         users_with_response = user_stats[user_stats['avg_response_time_minutes'].notna()]
         
         if not users_with_response.empty:
+            # Error bars are plain array differences, with no pandas index alignment
+            avg = users_with_response['avg_response_time_minutes'].to_numpy()
+            err_plus = users_with_response['max_response_time_minutes'].to_numpy() - avg
+            err_minus = avg - users_with_response['min_response_time_minutes'].to_numpy()
+            
             fig = go.Figure()
             
             fig.add_trace(go.Bar(
-                x=users_with_response['user'],
-                y=users_with_response['avg_response_time_minutes'],
+                x=users_with_response['user'].tolist(),
+                y=avg,
                 name='Avg Response Time',
                 marker_color='#1f77b4',
                 error_y=dict(
                     type='data',
                     symmetric=False,
-                    array=users_with_response['max_response_time_minutes'] - users_with_response['avg_response_time_minutes'],
-                    arrayminus=users_with_response['avg_response_time_minutes'] - users_with_response['min_response_time_minutes']
+                    array=err_plus,
+                    arrayminus=err_minus
                 ),
                 hovertemplate='<b>%{x}</b><br>Avg: %{y:.1f} min<extra></extra>'
             ))
             
+            fig.layout.template = PLOT_TEMPLATE
             fig.update_layout(
                 title='Average Response Time by User',
                 xaxis_title='User',
                 yaxis_title='Response Time (minutes)',
-                height=400,
-                template='plotly_white'
+                height=400
             )
         else:
-            fig = go.Figure()
-            fig.add_annotation(
-                text="Insufficient data for response time analysis",
-                xref="paper", yref="paper",
-                x=0.5, y=0.5, showarrow=False
-            )
-            fig.update_layout(height=400)
+            fig = self._empty_figure("Insufficient data for response time analysis")
         
         return fig
     
@@ -420,47 +476,42 @@ class ChatVisualizer:
         daily_pred = pd.DataFrame(predictions['future_activity']['daily_predictions'])
         
         if not daily_pred.empty:
-            fig = go.Figure()
-            
-            # Historical data
-            historical = self.df.groupby('date').size().reset_index(name='count')
-            recent_historical = historical.tail(30)
+            # Historical data: the last 30 days of the cached daily aggregate
+            recent_dates = self._daily_dates[-30:]
+            recent_counts = self._daily_counts[-30:]
             
-            fig.add_trace(go.Scatter(
-                x=recent_historical['date'],
-                y=recent_historical['count'],
-                mode='lines+markers',
-                name='Historical',
-                line=dict(color='#1f77b4', width=2),
-                marker=dict(size=6)
-            ))
-            
-            # Predictions
-            fig.add_trace(go.Scatter(
-                x=daily_pred['date'],
-                y=daily_pred['predicted_messages'],
-                mode='lines+markers',
-                name='Predicted',
-                line=dict(color='#ff7f0e', width=2, dash='dash'),
-                marker=dict(size=6)
-            ))
-            
-            fig.update_layout(
-                title='Activity Prediction for Next 7 Days',
-                xaxis_title='Date',
-                yaxis_title='Number of Messages',
-                height=400,
-                template='plotly_white',
-                hovermode='x unified'
+            fig = go.Figure(
+                data=[
+                    go.Scattergl(
+                        x=recent_dates,
+                        y=recent_counts,
+                        mode='lines+markers',
+                        name='Historical',
+                        line=dict(color='#1f77b4', width=2),
+                        marker=dict(size=6)
+                    ),
+                    # Predictions; datetime64 like the history, since an object column of
+                    # dates pushes Plotly's encoder onto a slower, nanosecond-formatted path
+                    go.Scattergl(
+                        x=pd.to_datetime(daily_pred['date']).to_numpy(),
+                        y=daily_pred['predicted_messages'].to_numpy(),
+                        mode='lines+markers',
+                        name='Predicted',
+                        line=dict(color='#ff7f0e', width=2, dash='dash'),
+                        marker=dict(size=6)
+                    )
+                ],
+                layout=dict(
+                    template=PLOT_TEMPLATE,
+                    title='Activity Prediction for Next 7 Days',
+                    xaxis_title='Date',
+                    yaxis_title='Number of Messages',
+                    height=400,
+                    hovermode='x unified'
+                )
             )
         else:
-            fig = go.Figure()
-            fig.add_annotation(
-                text="Insufficient data for predictions",
-                xref="paper", yref="paper",
-                x=0.5, y=0.5, showarrow=False
-            )
-            fig.update_layout(height=400)
+            fig = self._empty_figure("Insufficient data for predictions")
         
         return fig
     
@@ -472,46 +523,30 @@ class ChatVisualizer:
         if engagement_data:
             df_engagement = pd.DataFrame(engagement_data)
             
-            # Prepare data for heatmap
-            days = list(range(7))
-            hours = list(range(24))
-            
-            z_values = []
-            for day in days:
-                day_values = []
-                for hour in hours:
-                    value = df_engagement[
-                        (df_engagement['day_of_week'] == day) & 
-                        (df_engagement['hour'] == hour)
-                    ]['engagement_score'].values
-                    day_values.append(value[0] if len(value) > 0 else 0)
-                z_values.append(day_values)
-            
-            day_names = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
+            # One vectorized scatter instead of a boolean mask per cell
+            z_values = self._scatter_7x24(
+                df_engagement['day_of_week'].to_numpy(),
+                df_engagement['hour'].to_numpy(),
+                df_engagement['engagement_score'].to_numpy(dtype=np.float64)
+            )
             
             fig = go.Figure(data=go.Heatmap(
                 z=z_values,
-                x=[f"{h:02d}:00" for h in hours],
-                y=day_names,
+                x=HOUR_LABELS,
+                y=DAY_NAMES,
                 colorscale='RdYlGn',
                 hovertemplate='<b>%{y}</b><br>Time: %{x}<br>Engagement: %{z:.2f}<extra></extra>'
             ))
             
+            fig.layout.template = PLOT_TEMPLATE
             fig.update_layout(
                 title='Optimal Messaging Times - Engagement Heatmap',
                 xaxis_title='Hour of Day',
                 yaxis_title='Day of Week',
-                height=400,
-                template='plotly_white'
+                height=400
             )
         else:
-            fig = go.Figure()
-            fig.add_annotation(
-                text="Insufficient data for engagement analysis",
-                xref="paper", yref="paper",
-                x=0.5, y=0.5, showarrow=False
-            )
-            fig.update_layout(height=400)
+            fig = self._empty_figure("Insufficient data for engagement analysis")
         
         return fig
     
@@ -533,38 +568,38 @@ class ChatVisualizer:
                 )
             ])
             
+            fig.layout.template = PLOT_TEMPLATE
             fig.update_layout(
                 title='Average Message Chain Length by User',
                 xaxis_title='User',
                 yaxis_title='Average Chain Length',
-                height=400,
-                template='plotly_white'
+                height=400
             )
         else:
-            fig = go.Figure()
-            fig.add_annotation(
-                text="Insufficient data for conversation flow analysis",
-                xref="paper", yref="paper",
-                x=0.5, y=0.5, showarrow=False
-            )
-            fig.update_layout(height=400)
+            fig = self._empty_figure("Insufficient data for conversation flow analysis")
         
         return fig
     
     def create_comprehensive_dashboard(self, predictions):
         """Create a comprehensive dashboard with all visualizations"""
         
-        dashboard = {
-            'timeline': self.create_message_timeline(),
-            'user_activity': self.create_user_activity_chart(),
-            'hourly_heatmap': self.create_hourly_heatmap(),
-            'emoji_chart': self.create_emoji_chart(),
-            'word_cloud': self.create_word_cloud(),
-            'sentiment_timeline': self.create_sentiment_timeline(),
-            'response_time': self.create_response_time_chart(),
-            'prediction_chart': self.create_prediction_chart(predictions),
-            'optimal_time_chart': self.create_optimal_time_chart(predictions),
-            'conversation_flow': self.create_conversation_flow_chart()
+        tasks = {
+            'timeline': self.create_message_timeline,
+            'user_activity': self.create_user_activity_chart,
+            'hourly_heatmap': self.create_hourly_heatmap,
+            'emoji_chart': self.create_emoji_chart,
+            'word_cloud': self.create_word_cloud,
+            'sentiment_timeline': self.create_sentiment_timeline,
+            'response_time': self.create_response_time_chart,
+            'prediction_chart': partial(self.create_prediction_chart, predictions),
+            'optimal_time_chart': partial(self.create_optimal_time_chart, predictions),
+            'conversation_flow': self.create_conversation_flow_chart
         }
         
+        # Charts only read the aggregates built in __init__, so they are independent;
+        # the word cloud and NumPy work overlap with the Plotly figure building
+        with ThreadPoolExecutor(max_workers=min(8, len(tasks))) as executor:
+            futures = {name: executor.submit(task) for name, task in tasks.items()}
+            dashboard = {name: future.result() for name, future in futures.items()}
+        
         return dashboard